@@ -2,19 +2,29 @@
 
 import asyncio
 import os
-import ctypes
-import threading
+import glob
+import time
+import signal
+import struct
 import multiprocessing
-from multiprocessing import shared_memory
-from multiprocessing.synchronize import Event
-from typing import List, Tuple, Optional
+from multiprocessing.connection import Connection
+from typing import List, Tuple, Dict, Optional
 import psutil
 import math
 
 #######################################
 
+PROC_STAT_PATH = "/proc/stat"
+PROC_MEMINFO_PATH = "/proc/meminfo"
+PROC_DISKSTATS_PATH = "/proc/diskstats"
+THERMAL_ZONE_PATH = "/sys/class/thermal/thermal_zone0/temp"
+HWMON_ROOT_PATH = "/sys/class/hwmon"
+CPU_SENSOR_NAMES = ("coretemp", "cpu_thermal", "soc_thermal")  # hwmon sensor names in order of preference
+DISK_SECTOR_SIZE = 512  # /proc/diskstats always reports 512-byte sectors
+
 #############LOCAL IMPORTS#############
 
+from util.debug import LoggerManager
 from model.struct.sliding_window import SlidingWindow
 import util.functions.date as date
 from model.analytics.system import RealTimeSystemData, DiskMetrics
@@ -22,95 +32,23 @@ from analytics.validation import validation_metrics
 
 #######################################
 
-
-class SharedSystemData(ctypes.Structure):
-    """
-    ctypes-based shared memory structure holding raw system metrics.
-
-    This structure defines the exact binary layout used to exchange
-    system metrics between processes via shared memory. The layout is
-    intentionally simple and compact to minimize IPC overhead and avoid
-    serialization.
-
-    The structure is written exclusively by a dedicated writer process
-    and read by the main process. All consumers must treat this structure
-    as read-only. Access should be performed through the provided
-    properties, which expose Python-native types and handle NaN semantics
-    where applicable.
-
-    Numeric representation:
-    - Percentage values are stored as float32.
-    - Absolute resource values (RAM, disk) are stored as signed integers
-      representing bytes.
-    - Missing or unavailable numeric values are encoded as NaN where
-      applicable.
-
-    Fields:
-        _cpu_usage (float): CPU usage percentage (0–100).
-        _ram_available (int): Available RAM in bytes.
-        _total_ram (int): Total RAM in bytes.
-        _disk_usage (int): Used disk space in bytes.
-        _disk_total (int): Total disk space in bytes.
-        _disk_read (int): Total bytes read from disk since boot.
-        _disk_write (int): Total bytes written to disk since boot.
-        _disk_usage_valid (bool): Indicates if disk usage values are valid.
-        _disk_io_valid (bool): Indicates if disk I/O values are valid.
-        _cpu_temperature (float): CPU temperature in degrees Celsius,
-            or NaN if not available.
-    """
-
-    _fields_ = [
-        ("_cpu_usage", ctypes.c_float),
-        ("_ram_available", ctypes.c_uint64),
-        ("_total_ram", ctypes.c_uint64),
-        ("_disk_usage", ctypes.c_uint64),
-        ("_disk_total", ctypes.c_uint64),
-        ("_disk_read", ctypes.c_uint64),
-        ("_disk_write", ctypes.c_uint64),
-        ("_disk_usage_valid", ctypes.c_bool),
-        ("_disk_io_valid", ctypes.c_bool),
-        ("_cpu_temperature", ctypes.c_float),
-    ]
-
-    @property
-    def cpu_usage(self) -> float:
-        return float(self._cpu_usage)
-
-    @property
-    def ram_available(self) -> int:
-        return int(self._ram_available)
-
-    @property
-    def total_ram(self) -> int:
-        return int(self._total_ram)
-
-    @property
-    def disk_usage(self) -> int:
-        return int(self._disk_usage)
-
-    @property
-    def disk_total(self) -> int:
-        return int(self._disk_total)
-
-    @property
-    def disk_read(self) -> int:
-        return int(self._disk_read)
-
-    @property
-    def disk_write(self) -> int:
-        return int(self._disk_write)
-
-    @property
-    def disk_usage_valid(self) -> bool:
-        return bool(self._disk_usage_valid)
-
-    @property
-    def disk_io_valid(self) -> bool:
-        return bool(self._disk_io_valid)
-
-    @property
-    def cpu_temperature(self) -> float:
-        return float(self._cpu_temperature)
+# Binary layout of one system metrics snapshot sent from the writer process to the listener.
+# All derived values are computed by the writer, so the listener only dispatches them.
+# Fields, in order:
+#   cpu_use_perc (float64): CPU usage percentage (0-100), rounded to 2 decimals.
+#   ram_use_perc (float64): RAM usage percentage (0-100), rounded to 2 decimals.
+#   ram_usage (uint64): Used RAM in bytes.
+#   total_ram (uint64): Total RAM in bytes.
+#   disk_usage (uint64): Used disk space in bytes.
+#   disk_total (uint64): Total disk space in bytes.
+#   disk_read (uint64): Total bytes read from disk since boot.
+#   disk_write (uint64): Total bytes written to disk since boot.
+#   disk_read_speed (float64): Disk read speed in bytes per second, or NaN if not available.
+#   disk_write_speed (float64): Disk write speed in bytes per second, or NaN if not available.
+#   cpu_temperature (float64): CPU temperature in degrees Celsius rounded to 2 decimals, or NaN if not available.
+#   disk_usage_valid (bool): Indicates if disk usage values are valid.
+#   disk_io_valid (bool): Indicates if disk I/O values are valid.
+SYSTEM_SNAPSHOT_LAYOUT = struct.Struct("@ddQQQQQQddd??")
 
 
 class SystemMonitor:
@@ -118,29 +56,33 @@ class SystemMonitor:
     High-level system monitoring controller.
 
     This class coordinates a background writer process and a listener
-    thread to collect and consume real-time system metrics with minimal
+    task to collect and consume real-time system metrics with minimal
     overhead.
 
     Responsibilities:
-    - Owns and manages the shared memory region.
+    - Owns the pipe used to receive snapshots from the writer process.
     - Spawns a writer process responsible for sampling system metrics.
-    - Runs a listener thread that reacts to update events and updates
-      in-memory data structures.
+    - Runs a listener task on the event loop that receives snapshots
+      and updates in-memory data structures.
     - Provides accessors for historical and real-time monitoring data.
 
     The monitor is explicitly started and stopped using `start()` and
     `stop()`. No background activity occurs until `start()` is called.
 
     Design notes:
-    - Processes do not share Python objects; all cross-process data
-      exchange happens through shared memory.
-    - Threads are used only within the main process and may safely
-      access instance state.
-    - Events are used for synchronization instead of polling or locks.
+    - Processes do not share Python objects; each sample crosses the
+      process boundary as a single pre-packed `SYSTEM_SNAPSHOT_LAYOUT`
+      message, so the listener never observes a partial update.
+    - The listener runs on the event loop, so instance state and
+      asyncio primitives are only touched from the loop thread.
+    - Blocking pipe reads are used for synchronization instead of
+      polling or locks.
     """
 
     POLLING_INTERVAL_SECONDS = 1
     DATA_SIZE_SECONDS = 60
+    TEMPERATURE_POLLING_TICKS = 5  # CPU temperature changes slowly, sample it every N polling cycles
+    WRITER_JOIN_TIMEOUT_SECONDS = 5  # Grace period for the writer to exit before it is killed, and again after the kill
 
     def __init__(self):
         self.cpu_usage_perc: SlidingWindow[float] = SlidingWindow(max_size=self.DATA_SIZE_SECONDS)
@@ -150,223 +92,336 @@ class SystemMonitor:
         self.realtime_data = RealTimeSystemData(
             boot_date=date.to_iso(date.get_date_from_timestamp(int(psutil.boot_time()) * 1000))
         )
-        self.shared_memory: Optional[shared_memory.SharedMemory] = None
-        self.update_event = multiprocessing.Event()
-        self.stop_writer_event = multiprocessing.Event()
-        self.stop_listener_event = threading.Event()
-        self.writer_process: Optional[multiprocessing.Process] = None
-        self.listener_thread: Optional[threading.Thread] = None
+        self.receive_conn: Optional[Connection] = None
+        self.mp_context = SystemMonitor.get_writer_context()
+        self.stop_conn: Optional[Connection] = None  # Send end of the stop pipe, closed to stop the writer
+        self.writer_process: Optional[multiprocessing.process.BaseProcess] = None
+        self.listener_task: Optional[asyncio.Task] = None
         self.data_updated: asyncio.Event = asyncio.Event()
+        self._tick = 0  # Incremented on every received snapshot, used to validate the history cache
+        self._history_cache: Dict[str, Tuple[int, Tuple[float, ...]]] = {}
 
-    def start(self) -> None:
+    async def start(self) -> None:
         """
         Starts the system monitoring infrastructure.
 
         This method:
-        - Clears all synchronization events.
+        - Opens the snapshot pipe and the pipe used to stop the writer.
         - Spawns the writer process responsible for collecting system metrics.
-        - Starts the listener thread that waits for update events and
-        consumes shared memory data.
+        - Starts the listener task that receives and consumes snapshots.
 
         Raises:
             RuntimeError: If the monitor is already running.
         """
 
-        if self.writer_process is not None or self.listener_thread is not None or self.shared_memory is not None:
+        if self.writer_process is not None or self.listener_task is not None or self.receive_conn is not None:
             raise RuntimeError("SystemMonitor is already running.")
 
-        self.update_event.clear()
-        self.stop_writer_event.clear()
-        self.stop_listener_event.clear()
-        self.shared_memory = shared_memory.SharedMemory(create=True, size=ctypes.sizeof(SharedSystemData))
-        self.writer_process = multiprocessing.Process(
+        self.receive_conn, send_conn = self.mp_context.Pipe(duplex=False)
+        stop_receive_conn, self.stop_conn = self.mp_context.Pipe(duplex=False)
+        self.writer_process = self.mp_context.Process(
             target=SystemMonitor._writer,
-            args=(self.shared_memory.name, self.POLLING_INTERVAL_SECONDS, self.update_event, self.stop_writer_event),
+            args=(self.receive_conn, send_conn, stop_receive_conn, self.stop_conn, self.POLLING_INTERVAL_SECONDS),
         )
-        self.listener_thread = threading.Thread(target=self._listener, daemon=True)
         self.writer_process.start()
-        self.listener_thread.start()
+        # Only the writer keeps these ends open, so its exit surfaces as EOF on the receive end
+        send_conn.close()
+        stop_receive_conn.close()
+        loop = asyncio.get_running_loop()
+        self.listener_task = loop.create_task(self._listener())
 
-    def stop(self) -> None:
+    async def stop(self) -> None:
         """
         Stops the system monitoring infrastructure.
 
-        This method signals both the writer process and the listener thread
-        to terminate, wakes any blocked wait operations, and waits for all
-        background execution to complete before returning.
+        This method cancels the listener task, signals the writer process
+        to terminate, and waits for all background execution to complete
+        before returning. The writer exit closes the pipe, which releases
+        any executor thread still blocked on a receive.
+
+        The writer is signaled by closing the stop pipe, which never blocks,
+        even if the writer has already died.
+
+        A writer that does not exit within `WRITER_JOIN_TIMEOUT_SECONDS`
+        (e.g. stuck on an unresponsive mount) is killed and joined again
+        with the same timeout, so shutdown time is bounded. A writer still
+        alive after that (e.g. in uninterruptible sleep) is left behind
+        with a warning.
         """
 
-        self.stop_writer_event.set()
-        self.stop_listener_event.set()
-        self.update_event.set()
+        if self.stop_conn is not None:
+            self.stop_conn.close()
         self.data_updated.clear()
 
-        if self.writer_process is not None:
-            self.writer_process.join()
-
-        if self.listener_thread is not None:
-            self.listener_thread.join()
+        if self.listener_task is not None:
+            self.listener_task.cancel()
+            try:
+                await self.listener_task
+            except asyncio.CancelledError:
+                pass
 
-        if self.shared_memory is not None:
-            self.shared_memory.close()
-            self.shared_memory.unlink()
+        if self.writer_process is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.writer_process.join, self.WRITER_JOIN_TIMEOUT_SECONDS)
+            if self.writer_process.is_alive():
+                self.writer_process.kill()
+                await loop.run_in_executor(None, self.writer_process.join, self.WRITER_JOIN_TIMEOUT_SECONDS)
+            if self.writer_process.is_alive():
+                logger = LoggerManager.get_logger(__name__)
+                logger.warning("System monitor writer (pid %s) did not exit after being killed.", self.writer_process.pid)
+            else:
+                self.writer_process.close()
+
+        if self.receive_conn is not None:
+            self.receive_conn.close()
 
         self.writer_process = None
-        self.listener_thread = None
-        self.shared_memory = None
+        self.listener_task = None
+        self.receive_conn = None
+        self.stop_conn = None
 
     @staticmethod
-    def _writer(shared_mem_name: str, polling_interval: int, update_event: Event, stop_event: Event) -> None:
+    def _writer(
+        receive_conn: Connection,
+        send_conn: Connection,
+        stop_receive_conn: Connection,
+        stop_send_conn: Connection,
+        polling_interval: int,
+    ) -> None:
         """
         Background writer process entry point.
 
         This function runs in a separate process and is responsible for
-        periodically sampling system metrics and writing them into shared
-        memory.
+        periodically sampling system metrics and sending each sample to the
+        main process as a packed `SYSTEM_SNAPSHOT_LAYOUT` message.
+
+        The process terminates cleanly when the stop pipe reaches EOF, which
+        happens when the main process closes its end or exits, or when the
+        receiving end of the snapshot pipe is gone.
 
-        After each update, it signals the main process via `update_event`.
-        The process terminates cleanly when `stop_event` is set.
+        Samples are scheduled on a fixed cadence (`start + n * polling_interval`)
+        so the sampling work does not accumulate as drift, and the real elapsed
+        time between samples is published alongside the metrics.
 
         Args:
-            shared_mem_name: Name of the shared memory block to attach to.
+            receive_conn: Receive end of the snapshot pipe, inherited from the main process and closed on entry.
+            send_conn: Send end of the snapshot pipe.
+            stop_receive_conn: Receive end of the stop pipe, waited on between samples.
+            stop_send_conn: Send end of the stop pipe, inherited from the main process and closed on entry.
             polling_interval: Update interval in seconds.
-            update_event: Event used to notify the listener of new data.
-            stop_event: Event used to request process termination.
         """
 
-        shared_mem = shared_memory.SharedMemory(name=shared_mem_name)
-        buffer = shared_mem.buf
-        assert buffer is not None
-        data = SharedSystemData.from_buffer(buffer)
+        # Forked after the main process installed its loop signal handlers, which would ignore signals aimed at the
+        # writer and forward them to the main loop through the inherited wakeup fd, so the defaults are restored
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.set_wakeup_fd(-1)
+        # Only the main process may hold these ends, otherwise its exit never breaks the pipes for the writer
+        receive_conn.close()
+        stop_send_conn.close()
         partition = SystemMonitor.get_disk_path_partition(os.path.dirname(os.path.realpath(__file__)))
+        # procfs/sysfs descriptors are kept open for the whole process lifetime (None when unavailable)
+        stat_fd = SystemMonitor.open_proc_file(PROC_STAT_PATH)
+        meminfo_fd = SystemMonitor.open_proc_file(PROC_MEMINFO_PATH)
+        diskstats_fd = SystemMonitor.open_proc_file(PROC_DISKSTATS_PATH)
+        thermal_fds = [
+            fd for fd in map(SystemMonitor.open_proc_file, SystemMonitor.get_cpu_temperature_paths()) if fd is not None
+        ]
+        cpu_times: Optional[Tuple[int, int]] = None  # (idle, total) jiffies from the previous /proc/stat sample
+        cpu_temperature = math.nan
+        prev_disk_read: Optional[int] = None
+        prev_disk_write: Optional[int] = None
+        tick = 0
+        start_time = time.monotonic()
+        last_sample_time: Optional[float] = None
         try:
-            while not stop_event.is_set():
-                data._cpu_usage = SystemMonitor.get_cpu_performance(interval=None)
-                data._ram_available, data._total_ram = SystemMonitor.get_ram_performance()
-                if partition is not None:
-                    disk_metrics = SystemMonitor.get_disk_performance(partition[0], partition[1])
-                    data._disk_usage = disk_metrics.usage
-                    data._disk_total = disk_metrics.total
-                    data._disk_read = disk_metrics.read_bytes
-                    data._disk_write = disk_metrics.write_bytes
-                    data._disk_usage_valid = disk_metrics.usage_valid
-                    data._disk_io_valid = disk_metrics.io_valid
-                data._cpu_temperature = SystemMonitor.get_cpu_temperature()
-                update_event.set()
-                stop_event.wait(timeout=polling_interval)
+            while True:
+                sample_time = time.monotonic()
+                dt = sample_time - last_sample_time if last_sample_time is not None else polling_interval
+                if dt <= 0:
+                    dt = polling_interval
+                last_sample_time = sample_time
+                cpu_usage, cpu_times = SystemMonitor.get_cpu_performance(stat_fd, cpu_times)
+                ram_available, total_ram = SystemMonitor.get_ram_performance(meminfo_fd)
+                disk_metrics = (
+                    SystemMonitor.get_disk_performance(partition[0], partition[1], diskstats_fd)
+                    if partition is not None
+                    else None
+                )
+                if tick % SystemMonitor.TEMPERATURE_POLLING_TICKS == 0:
+                    cpu_temperature = round(SystemMonitor.get_cpu_temperature(thermal_fds), 2)
+
+                ram_usage = total_ram - ram_available
+                disk_read_speed = disk_write_speed = math.nan
+                if disk_metrics is not None and disk_metrics.io_valid:
+                    if prev_disk_read is not None and prev_disk_write is not None:
+                        disk_read_speed = max(0.0, (disk_metrics.read_bytes - prev_disk_read) / dt)
+                        disk_write_speed = max(0.0, (disk_metrics.write_bytes - prev_disk_write) / dt)
+                    prev_disk_read = disk_metrics.read_bytes
+                    prev_disk_write = disk_metrics.write_bytes
+                else:
+                    prev_disk_read = prev_disk_write = None
+
+                snapshot = SYSTEM_SNAPSHOT_LAYOUT.pack(
+                    round(cpu_usage, 2),
+                    round(ram_usage / total_ram * 100, 2),
+                    ram_usage,
+                    total_ram,
+                    disk_metrics.usage if disk_metrics is not None else 0,
+                    disk_metrics.total if disk_metrics is not None else 0,
+                    disk_metrics.read_bytes if disk_metrics is not None else 0,
+                    disk_metrics.write_bytes if disk_metrics is not None else 0,
+                    disk_read_speed,
+                    disk_write_speed,
+                    cpu_temperature,
+                    disk_metrics is not None and disk_metrics.usage_valid,
+                    disk_metrics is not None and disk_metrics.io_valid,
+                )
+                try:
+                    send_conn.send_bytes(snapshot)
+                except (BrokenPipeError, OSError):
+                    break  # Main process closed its end of the pipe
+                tick += 1
+                sleep_for = start_time + tick * polling_interval - time.monotonic()
+                if sleep_for < -polling_interval:
+                    # Fell behind by more than a cycle (e.g. host suspended), re-anchor instead of bursting
+                    start_time = time.monotonic() - tick * polling_interval
+                if stop_receive_conn.poll(max(0.0, sleep_for)):
+                    break  # Stop pipe closed by the main process
         finally:
-            del data
-            shared_mem.close()
+            for fd in (stat_fd, meminfo_fd, diskstats_fd, *thermal_fds):
+                if fd is not None:
+                    os.close(fd)
+            send_conn.close()
+            stop_receive_conn.close()
 
-    def _listener(self) -> None:
+    async def _listener(self) -> None:
         """
-        Background listener thread entry point.
+        Background listener task entry point.
 
-        This method runs in a dedicated thread within the main process.
-        It blocks on `update_event` and, when signaled, reads the latest
-        system metrics from shared memory and updates local data structures.
+        This coroutine runs on the main event loop. It receives each
+        snapshot from the writer pipe through the default executor, into a
+        preallocated buffer, and updates local data structures.
 
-        The thread exits cleanly when `stop_listener_event` is set.
+        The task exits when it is cancelled by `stop()` or when the writer
+        process closes the pipe.
         """
 
-        assert self.shared_memory is not None and self.shared_memory.buf is not None
-        data = SharedSystemData.from_buffer(self.shared_memory.buf)
-        prev_disk_read: Optional[int] = None
-        prev_disk_write: Optional[int] = None
-        try:
-            while not self.stop_listener_event.is_set():
-                self.update_event.wait()
-                self.update_event.clear()
-                if self.stop_listener_event.is_set():
-                    break
-
-                cpu_use_perc = round(data.cpu_usage, 2)
-                ram_use_perc = round(((data.total_ram - data.ram_available) / data.total_ram) * 100, 2)
-                ram_usage = data.total_ram - data.ram_available
-                total_ram = data.total_ram
-                disk_usage = data.disk_usage if data.disk_usage_valid else None
-                disk_total = data.disk_total if data.disk_usage_valid else None
-                disk_read = data.disk_read if data.disk_io_valid else None
-                disk_write = data.disk_write if data.disk_io_valid else None
-                cpu_temp = round(data.cpu_temperature, 2) if not math.isnan(data.cpu_temperature) else None
-
-                self.cpu_usage_perc.add(cpu_use_perc)
-                self.ram_usage_perc.add(ram_use_perc)
-                ########## Validation ##########
-                validation_metrics.load.cpu_metrics.update_metrics(cpu_use_perc)
-                validation_metrics.load.ram_metrics.update_metrics(ram_usage)
-                ################################
-                if disk_read is not None and prev_disk_read is not None:
-                    disk_read_speed = (disk_read - prev_disk_read) / self.POLLING_INTERVAL_SECONDS
-                    if disk_read_speed < 0:
-                        disk_read_speed = 0
-                    self.disk_read_speed.add(disk_read_speed)
-
-                if disk_write is not None and prev_disk_write is not None:
-                    disk_write_speed = (disk_write - prev_disk_write) / self.POLLING_INTERVAL_SECONDS
-                    if disk_write_speed < 0:
-                        disk_write_speed = 0
-                    self.disk_write_speed.add(disk_write_speed)
-
-                self.realtime_data.cpu_use_perc = cpu_use_perc
-                self.realtime_data.ram_use_perc = ram_use_perc
-                self.realtime_data.ram_usage = ram_usage
-                self.realtime_data.total_ram = total_ram
-                self.realtime_data.disk_usage = disk_usage
-                self.realtime_data.disk_total = disk_total
-                self.realtime_data.disk_read = disk_read
-                self.realtime_data.disk_write = disk_write
-                self.realtime_data.cpu_temp = cpu_temp
-                self.data_updated.set()
-
-                prev_disk_read = disk_read
-                prev_disk_write = disk_write
-        finally:
-            del data
-
-    def get_cpu_usage_history(self) -> List[float]:
+        assert self.receive_conn is not None
+        receive_conn = self.receive_conn
+        buffer = bytearray(SYSTEM_SNAPSHOT_LAYOUT.size)
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, receive_conn.recv_bytes_into, buffer)
+            except EOFError:
+                break  # Writer process exited
+
+            (
+                cpu_use_perc,
+                ram_use_perc,
+                ram_usage,
+                total_ram,
+                disk_usage,
+                disk_total,
+                disk_read,
+                disk_write,
+                disk_read_speed,
+                disk_write_speed,
+                cpu_temperature,
+                disk_usage_valid,
+                disk_io_valid,
+            ) = SYSTEM_SNAPSHOT_LAYOUT.unpack_from(buffer, 0)
+
+            self.cpu_usage_perc.add(cpu_use_perc)
+            self.ram_usage_perc.add(ram_use_perc)
+            ########## Validation ##########
+            validation_metrics.load.cpu_metrics.update_metrics(cpu_use_perc)
+            validation_metrics.load.ram_metrics.update_metrics(ram_usage)
+            ################################
+            # NaN is the only value not equal to itself, cheaper than a math.isnan call per tick
+            if disk_read_speed == disk_read_speed:
+                self.disk_read_speed.add(disk_read_speed)
+            if disk_write_speed == disk_write_speed:
+                self.disk_write_speed.add(disk_write_speed)
+
+            self.realtime_data.cpu_use_perc = cpu_use_perc
+            self.realtime_data.ram_use_perc = ram_use_perc
+            self.realtime_data.ram_usage = ram_usage
+            self.realtime_data.total_ram = total_ram
+            self.realtime_data.disk_usage = disk_usage if disk_usage_valid else None
+            self.realtime_data.disk_total = disk_total if disk_usage_valid else None
+            self.realtime_data.disk_read = disk_read if disk_io_valid else None
+            self.realtime_data.disk_write = disk_write if disk_io_valid else None
+            self.realtime_data.cpu_temp = None if cpu_temperature != cpu_temperature else cpu_temperature
+            self._tick += 1
+            self.data_updated.set()
+
+    def get_cpu_usage_history(self) -> Tuple[float, ...]:
         """
         Returns the historical CPU usage values.
 
         Returns:
-            A list of CPU usage percentages collected over the configured
+            A tuple of CPU usage percentages collected over the configured
             time window.
         """
 
-        return self.cpu_usage_perc.get_list()
+        return self._get_history("cpu_usage", self.cpu_usage_perc)
 
-    def get_ram_usage_history(self) -> List[float]:
+    def get_ram_usage_history(self) -> Tuple[float, ...]:
         """
         Returns the historical RAM usage values.
 
         Returns:
-            A list of RAM usage percentages collected over the configured
+            A tuple of RAM usage percentages collected over the configured
             time window.
         """
 
-        return self.ram_usage_perc.get_list()
+        return self._get_history("ram_usage", self.ram_usage_perc)
 
-    def get_disk_read_speed_history(self) -> List[float]:
+    def get_disk_read_speed_history(self) -> Tuple[float, ...]:
         """
         Returns the historical disk read speed values.
 
         Returns:
-            A list of disk read speeds in bytes per second collected over the configured
+            A tuple of disk read speeds in bytes per second collected over the configured
             time window.
         """
 
-        return self.disk_read_speed.get_list()
+        return self._get_history("disk_read_speed", self.disk_read_speed)
 
-    def get_disk_write_speed_history(self) -> List[float]:
+    def get_disk_write_speed_history(self) -> Tuple[float, ...]:
         """
         Returns the historical disk write speed values.
 
         Returns:
-            A list of disk write speeds in bytes per second collected over the configured
+            A tuple of disk write speeds in bytes per second collected over the configured
             time window.
         """
 
-        return self.disk_write_speed.get_list()
+        return self._get_history("disk_write_speed", self.disk_write_speed)
+
+    def _get_history(self, key: str, window: SlidingWindow[float]) -> Tuple[float, ...]:
+        """
+        Returns the contents of a history window, cached per received sample.
+
+        The window is only materialized once per listener tick; repeated
+        reads between samples return the same immutable tuple.
+
+        Args:
+            key: Cache key identifying the history window.
+            window: Sliding window holding the history values.
+
+        Returns:
+            A tuple of values ordered from most recent to oldest.
+        """
+
+        cached = self._history_cache.get(key)
+        if cached is not None and cached[0] == self._tick:
+            return cached[1]
+        history = tuple(window.get_list())
+        self._history_cache[key] = (self._tick, history)
+        return history
 
     def get_realtime_data(self) -> RealTimeSystemData:
         """
@@ -379,58 +434,188 @@ class SystemMonitor:
         return self.realtime_data
 
     @staticmethod
-    def get_cpu_temperature() -> float:
+    def get_writer_context() -> multiprocessing.context.BaseContext:
+        """
+        Returns the multiprocessing context used for the writer process.
+
+        `fork` is preferred, as the writer then starts from the already
+        imported parent modules instead of re-importing the application.
+        Platforms without `fork` (e.g. Windows) use the default context.
+
+        Returns:
+            The multiprocessing context to create the writer primitives with.
+        """
+
+        try:
+            return multiprocessing.get_context("fork")
+        except ValueError:
+            return multiprocessing.get_context()
+
+    @staticmethod
+    def open_proc_file(path: str) -> Optional[int]:
+        """
+        Opens a procfs/sysfs file for repeated reads.
+
+        The returned descriptor is meant to be kept open and read with
+        `os.pread` at offset 0 on every sample, which avoids the
+        open/close overhead of each polling cycle.
+
+        Args:
+            path: Path of the file to open.
+
+        Returns:
+            The file descriptor, or None if the file is not available
+            on the current platform.
+        """
+
+        try:
+            return os.open(path, os.O_RDONLY)
+        except (OSError, AttributeError):
+            return None
+
+    @staticmethod
+    def get_cpu_temperature_paths() -> List[str]:
+        """
+        Resolves the sysfs files exposing the CPU temperature.
+
+        Looks for a known CPU sensor among the hwmon devices and returns all of
+        its temperature inputs (e.g. one per core for `coretemp`). Falls back to
+        the first thermal zone (Raspberry Pi / generic Linux) when no known
+        sensor is found. Intended to be called once, as the sensor layout does
+        not change while the system is running.
+
+        Returns:
+            A list of temperature input file paths, empty if none is available.
+        """
+
+        sensors: Dict[str, List[str]] = {}
+        inputs = glob.glob(os.path.join(HWMON_ROOT_PATH, "hwmon*", "temp*_input"))
+        inputs.extend(glob.glob(os.path.join(HWMON_ROOT_PATH, "hwmon*", "device", "temp*_input")))
+        for path in sorted(inputs):
+            try:
+                with open(os.path.join(os.path.dirname(path), "name")) as file:
+                    name = file.read().strip()
+            except OSError:
+                continue
+            sensors.setdefault(name, []).append(path)
+
+        for name in CPU_SENSOR_NAMES:
+            if name in sensors:
+                return sensors[name]
+
+        return [THERMAL_ZONE_PATH] if os.path.exists(THERMAL_ZONE_PATH) else []
+
+    @staticmethod
+    def get_cpu_temperature(thermal_fds: List[int]) -> float:
         """
         Retrieves the current CPU temperature.
 
+        Args:
+            thermal_fds: Open descriptors of the temperature input files
+                resolved by `get_cpu_temperature_paths`.
+
         Returns:
-            Maximum CPU core temperature in degrees Celsius.
+            Maximum CPU temperature in degrees Celsius.
             Returns NaN if the temperature cannot be determined.
         """
 
-        # psutil temperature sensors are not available on all platforms
-        sensors_temperatures = getattr(psutil, "sensors_temperatures", None)
-
-        if sensors_temperatures is not None:
+        temperature = math.nan
+        for fd in thermal_fds:
             try:
-                temps = sensors_temperatures()
-                if temps:
-                    for key in ("coretemp", "cpu_thermal", "soc_thermal"):
-                        entries = temps.get(key)
-                        if entries:
-                            values = [t.current for t in entries if t.current is not None]
-                            if values:
-                                return max(values)
-            except Exception:
-                pass
+                value = int(os.pread(fd, 32, 0)) / 1000.0  # Reported in millidegrees Celsius
+            except (OSError, ValueError):
+                continue
+            if math.isnan(temperature) or value > temperature:
+                temperature = value
 
-        # Raspberry Pi / Linux fallback
-        try:
-            with open("/sys/class/thermal/thermal_zone0/temp") as f:
-                return int(f.read().strip()) / 1000.0
-        except Exception:
-            return math.nan
+        return temperature
 
     @staticmethod
-    def get_ram_performance() -> Tuple[int, int]:
+    def get_ram_performance(meminfo_fd: Optional[int] = None) -> Tuple[int, int]:
         """
         Retrieves the current RAM usage of the system.
+
+        Args:
+            meminfo_fd: Open descriptor of /proc/meminfo, if available.
+
         Returns:
             A tuple containing available RAM and total RAM in bytes.
         """
 
+        if meminfo_fd is not None:
+            try:
+                # MemTotal and MemAvailable are always within the first few lines
+                buffer = os.pread(meminfo_fd, 512, 0)
+                return (
+                    SystemMonitor._parse_meminfo_value(buffer, b"MemAvailable:"),
+                    SystemMonitor._parse_meminfo_value(buffer, b"MemTotal:"),
+                )
+            except (OSError, ValueError):
+                pass
+
         virtual_memory = psutil.virtual_memory()
         return (virtual_memory.available, virtual_memory.total)
 
     @staticmethod
-    def get_cpu_performance(interval: Optional[float] = None) -> float:
+    def _parse_meminfo_value(buffer: bytes, key: bytes) -> int:
+        """
+        Extracts a value from a raw /proc/meminfo buffer.
+
+        Args:
+            buffer: Raw contents of /proc/meminfo.
+            key: Field name including the trailing colon (e.g. b"MemTotal:").
+
+        Returns:
+            The field value in bytes.
+
+        Raises:
+            ValueError: If the field is not present in the buffer.
+        """
+
+        start = buffer.index(key) + len(key)
+        end = buffer.index(b"\n", start)
+        return int(buffer[start:end].split()[0]) * 1024  # Values are reported in kB
+
+    @staticmethod
+    def get_cpu_performance(
+        stat_fd: Optional[int] = None, prev_times: Optional[Tuple[int, int]] = None
+    ) -> Tuple[float, Optional[Tuple[int, int]]]:
         """
         Retrieves the current CPU usage percentage of the system.
+
+        The usage is computed from the aggregated `cpu` line of /proc/stat as
+        the busy fraction of the jiffies elapsed since `prev_times`. When no
+        previous sample is given the usage is reported as 0.0.
+
+        Args:
+            stat_fd: Open descriptor of /proc/stat, if available.
+            prev_times: (idle, total) jiffies returned by the previous call.
+
         Returns:
-            CPU usage as a float representing the overall CPU usage percentage.
+            A tuple containing the overall CPU usage percentage and the
+            (idle, total) jiffies to pass to the next call, or None for the
+            latter when /proc/stat is not available.
         """
 
-        return psutil.cpu_percent(interval)
+        if stat_fd is None:
+            return psutil.cpu_percent(None), None
+
+        try:
+            # cpu  user nice system idle iowait irq softirq steal guest guest_nice
+            # (guest time is already accounted in user/nice, so it is left out of the total)
+            fields = os.pread(stat_fd, 256, 0).split(b"\n", 1)[0].split()
+            user, nice, system, idle, iowait, irq, softirq, steal = (int(value) for value in fields[1:9])
+        except (OSError, ValueError, IndexError):
+            # The next successful sample starts a new baseline
+            return psutil.cpu_percent(None), None
+        idle_time = idle + iowait
+        total_time = user + nice + system + idle_time + irq + softirq + steal
+
+        times = (idle_time, total_time)
+        if prev_times is None or total_time <= prev_times[1]:
+            return 0.0, times
+
+        return 100.0 * (1.0 - (idle_time - prev_times[0]) / (total_time - prev_times[1])), times
 
     @staticmethod
     def get_disk_path_partition(disk_path: str) -> Optional[Tuple[str, str]]:
@@ -452,9 +637,81 @@ class SystemMonitor:
         return current_partition if current_partition else None
 
     @staticmethod
-    def get_disk_performance(partition: str, mountpoint: str) -> DiskMetrics:
+    def get_disk_performance(partition: str, mountpoint: str, diskstats_fd: Optional[int] = None) -> DiskMetrics:
         """
         Retrieves the current disk usage of the app's partition.
+
+        Args:
+            partition: Device name of the partition (e.g. "sda1").
+            mountpoint: Mount point of the partition.
+            diskstats_fd: Open descriptor of /proc/diskstats, if available.
+
+        Returns:
+            A DiskMetrics instance containing disk usage and I/O statistics.
+        """
+
+        if diskstats_fd is None:
+            return SystemMonitor._get_disk_performance_psutil(partition, mountpoint)
+
+        usage: Optional[Tuple[int, int]] = None
+        try:
+            stats = os.statvfs(mountpoint)
+            usage = ((stats.f_blocks - stats.f_bfree) * stats.f_frsize, stats.f_blocks * stats.f_frsize)
+        except OSError:
+            pass
+
+        io_counters: Optional[Tuple[int, int]] = None
+        try:
+            buffer = SystemMonitor._read_proc_file(diskstats_fd)
+            # <name> reads reads_merged sectors_read ms_read writes writes_merged sectors_written ...
+            start = buffer.find(b" " + partition.encode() + b" ")
+            if start != -1:
+                end = buffer.find(b"\n", start)
+                fields = buffer[start : end if end != -1 else len(buffer)].split()
+                io_counters = (int(fields[3]) * DISK_SECTOR_SIZE, int(fields[7]) * DISK_SECTOR_SIZE)
+        except (OSError, ValueError, IndexError):
+            pass
+
+        return DiskMetrics(
+            usage=usage[0] if usage else 0,
+            total=usage[1] if usage else 0,
+            read_bytes=io_counters[0] if io_counters else 0,
+            write_bytes=io_counters[1] if io_counters else 0,
+            usage_valid=usage is not None,
+            io_valid=io_counters is not None,
+        )
+
+    @staticmethod
+    def _read_proc_file(fd: int, chunk_size: int = 8192) -> bytes:
+        """
+        Reads the whole content of a procfs file from offset 0.
+
+        Args:
+            fd: Open descriptor of the file.
+            chunk_size: Number of bytes requested per read.
+
+        Returns:
+            The file content.
+        """
+
+        chunks: List[bytes] = []
+        offset = 0
+        while True:
+            chunk = os.pread(fd, chunk_size, offset)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            offset += len(chunk)
+
+        return b"".join(chunks)
+
+    @staticmethod
+    def _get_disk_performance_psutil(partition: str, mountpoint: str) -> DiskMetrics:
+        """
+        Retrieves the disk usage of the app's partition through psutil.
+
+        Used on platforms without procfs.
+
         Returns:
             A DiskMetrics instance containing disk usage and I/O statistics.
         """
@@ -6,22 +6,32 @@ from dotenv import load_dotenv
 # Load dev environment only if explicitly present in the backend root directory
 dev_env = Path(__file__).resolve().parent / ".env"
 
-if dev_env.exists():
-    load_dotenv(dev_env)
+# Child processes inherit the parent environment, so the file is only parsed once per process tree
+if os.environ.get("_ENV_LOADED") != "1":
+    if dev_env.exists():
+        load_dotenv(dev_env)
+    os.environ["_ENV_LOADED"] = "1"
+
+
+def _int_env(name: str, default: int) -> int:
+    """Returns the environment variable `name` as an integer, or `default` if unset."""
+
+    value = os.getenv(name)
+    return int(value) if value is not None else default
+
 
 # Paths
 DB_PATH = os.getenv("DB_PATH", "./data/sqlite")
 APP_DATA_PATH = os.getenv("APP_DATA_PATH", "./data")
+UI_STATIC_PATH = os.getenv("UI_STATIC_PATH")  # Optional prebuilt UI served by the backend itself
 
 # Hostnames
 HTTP_HOSTNAME = os.getenv("HTTP_HOSTNAME", "0.0.0.0")
 TIMEDB_HOSTNAME = os.getenv("TIMEDB_HOSTNAME", "127.0.0.1")
 
 # Ports
-HTTP_PORT = os.getenv("HTTP_PORT", 8000)
-HTTP_PORT = int(HTTP_PORT) if HTTP_PORT is not None else None
-TIMEDB_PORT = os.getenv("TIMEDB_PORT", 8086)
-TIMEDB_PORT = int(TIMEDB_PORT) if TIMEDB_PORT is not None else None
+HTTP_PORT = _int_env("HTTP_PORT", 8000)
+TIMEDB_PORT = _int_env("TIMEDB_PORT", 8086)
 
 # Credentials
 TIMEDB_USERNAME = os.getenv("TIMEDB_USERNAME")
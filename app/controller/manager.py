@@ -1,13 +1,13 @@
 ###########EXTERNAL IMPORTS############
 
 import asyncio
-from typing import Optional, Dict, Set, Any
+from typing import Optional, Dict, Set, Tuple, Any, Callable, Union
 
 #######################################
 
 #############LOCAL IMPORTS#############
 
-from mqtt.client import MQTTMessage
+from mqtt.client import MQTTMessage, MQTTMessageBatch
 from db.db import SQLiteDBClient
 from model.controller.device import EnergyMeterRecord
 from controller.registry.protocol import ProtocolRegistry
@@ -24,58 +24,68 @@ class DeviceManager:
     database persistence, and periodic state publishing via MQTT.
 
     Responsibilities:
-        - Maintains a set of active devices (EnergyMeter instances).
+        - Maintains a registry of active devices (EnergyMeter instances) indexed by ID.
         - Publishes device status and data to an MQTT broker.
         - Interfaces with the SQLite database for persisting and retrieving device configurations.
         - Routes measurement data from devices to the appropriate processing queue.
 
     Attributes:
-        devices (Set[Device]): A set of registered devices currently managed in memory.
+        devices (Dict[int, EnergyMeter]): Registered devices currently managed in memory, keyed by device ID.
         enable_publish (asyncio.Event): Event used to enable/disable device publishing.
-        publish_queue (asyncio.Queue): Queue used to send MQTT messages from devices.
+        publish (Callable[[Union[MQTTMessage, MQTTMessageBatch]], None]): Callback used to queue MQTT messages from devices.
         measurements_queue (asyncio.Queue): Queue used to send measurement data from devices.
         devices_db (SQLiteDBClient): Database client used for persisting and loading devices and their nodes.
     """
 
+    PUBLISH_COALESCE_SECONDS = 0.05  # Window used to group device data publishes into a single queue item
+
     def __init__(
         self,
         enable_publish: asyncio.Event,
-        publish_queue: asyncio.Queue,
+        publish: Callable[[Union[MQTTMessage, MQTTMessageBatch]], None],
         measurements_queue: asyncio.Queue,
         devices_db: SQLiteDBClient,
     ):
-        self.devices: Set[EnergyMeter] = set()
+        self.devices: Dict[int, EnergyMeter] = {}
         self.enable_publish = enable_publish
-        self.publish_queue = publish_queue
+        self.publish = publish
         self.measurements_queue = measurements_queue
         self.devices_db = devices_db
         self.handler_task: Optional[asyncio.Task] = None
+        self.flush_task: Optional[asyncio.Task] = None
+        self._pending: Dict[str, MQTTMessage] = {}  # Latest device data message per topic, waiting to be flushed
+        self._flush_event = asyncio.Event()
+        # Device state payload per device id, tagged with the device state version it was built from
+        self._device_payload_cache: Dict[int, Tuple[int, Dict[str, Any]]] = {}
 
     async def start(self) -> None:
         """
-        Starts the device handling background task.
+        Starts the device handling and publish flushing background tasks.
         """
 
-        if self.handler_task is not None:
+        if self.handler_task is not None or self.flush_task is not None:
             raise RuntimeError("Handler task is already instantiated")
 
         await self.init_devices()
-        loop = asyncio.get_event_loop()
-        self.handler_task = loop.create_task(self.handle_devices())
+        self.handler_task = asyncio.create_task(self.handle_devices())
+        self.flush_task = asyncio.create_task(self.flush_device_data())
 
     async def stop(self) -> None:
         """
-        Stops and cancels the device handling background task.
+        Stops and cancels the device handling and publish flushing background tasks.
         """
 
-        try:
-            await self.stop_devices()
-            if self.handler_task:
-                self.handler_task.cancel()
-                await self.handler_task
-                self.handler_task = None
-        except asyncio.CancelledError:
-            pass
+        await self.stop_devices()
+        for task in (self.handler_task, self.flush_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self.handler_task = None
+        self.flush_task = None
+        self._pending.clear()
 
     async def init_devices(self) -> None:
         """
@@ -94,7 +104,7 @@ class DeviceManager:
         Stops all registered devices asynchronously.
         """
 
-        for device in self.devices:
+        for device in self.devices.values():
             validation_metrics.devices_comm.pop(device.id, None)
             validation_metrics.devices_logs.pop(device.id, None)
             await device.stop()
@@ -117,7 +127,7 @@ class DeviceManager:
         validation_metrics.devices_comm[device.id] = DeviceCommunicationValidation(device.name, device.id)
         validation_metrics.devices_logs[device.id] = DeviceLoggingValidation(device.name, device.id)
         await device.start()
-        self.devices.add(device)
+        self.devices[device.id] = device
 
     async def delete_device(self, device: EnergyMeter) -> None:
         """
@@ -130,7 +140,8 @@ class DeviceManager:
         validation_metrics.devices_comm.pop(device.id, None)
         validation_metrics.devices_logs.pop(device.id, None)
         await device.stop()
-        self.devices.discard(device)
+        self.devices.pop(device.id, None)
+        self._device_payload_cache.pop(device.id, None)
 
     def get_device(self, device_id: int) -> Optional[EnergyMeter]:
         """
@@ -143,7 +154,7 @@ class DeviceManager:
             Optional[Device]: The matched device, or None if not found.
         """
 
-        return next((device for device in self.devices if device.id == device_id), None)
+        return self.devices.get(device_id)
 
     async def handle_devices(self):
         """
@@ -157,6 +168,9 @@ class DeviceManager:
     async def publish_devices_state(self):
         """
         Publishes a dictionary of all device states to the MQTT queue.
+
+        Per-device entries are cached and only rebuilt when the device
+        `state_version` changes.
         """
 
         if not self.enable_publish.is_set():
@@ -164,20 +178,31 @@ class DeviceManager:
 
         topic = "devices"
         payload: Dict[int, Dict[str, Any]] = {}
-        for device in self.devices:
-            payload[device.id] = {
-                "name": device.name,
-                "protocol": device.protocol,
-                "type": device.meter_type,
-                "connected": device.connected,
-            }
-
-        await self.publish_queue.put(MQTTMessage(qos=0, topic=topic, payload=payload))
+        for device in self.devices.values():
+            cached = self._device_payload_cache.get(device.id)
+            if cached is None or cached[0] != device.state_version:
+                cached = (
+                    device.state_version,
+                    {
+                        "name": device.name,
+                        "protocol": device.protocol,
+                        "type": device.meter_type,
+                        "connected": device.connected,
+                    },
+                )
+                self._device_payload_cache[device.id] = cached
+            payload[device.id] = cached[1]
+
+        self.publish(MQTTMessage(qos=0, topic=topic, payload=payload))
 
     async def publish_device_data(self, device: EnergyMeter) -> None:
         """
         Publishes device data to the MQTT queue if publishing is enabled.
 
+        The message is not queued directly: it replaces any pending message
+        for the same device and is flushed together with the other devices
+        publishing within `PUBLISH_COALESCE_SECONDS`.
+
         Args:
             device (EnergyMeter): The device to publish data for.
         """
@@ -196,7 +221,28 @@ class DeviceManager:
             payload[node.config.name] = node.get_publish_format()
 
         if payload:
-            await self.publish_queue.put(MQTTMessage(qos=0, topic=topic, payload=payload))
+            self._pending[topic] = MQTTMessage(qos=0, topic=topic, payload=payload)
+            self._flush_event.set()
+
+    async def flush_device_data(self) -> None:
+        """
+        Flushes pending device data messages to the MQTT queue.
+
+        Waits for a device to publish, lets other devices join the batch
+        for `PUBLISH_COALESCE_SECONDS` and then puts every pending message
+        into the queue as a single MQTTMessageBatch.
+        """
+
+        while True:
+            await self._flush_event.wait()
+            await asyncio.sleep(self.PUBLISH_COALESCE_SECONDS)
+            self._flush_event.clear()
+            if not self._pending:
+                continue
+            batch = MQTTMessageBatch(messages=list(self._pending.values()))
+            self._pending = {}
+            if self.enable_publish.is_set():
+                self.publish(batch)
 
     def create_device_from_record(self, record: EnergyMeterRecord) -> EnergyMeter:
         """
@@ -64,6 +64,7 @@ class EnergyMeter:
         meter_nodes (EnergyMeterNodes): Manager for validating and handling node configurations and relationships.
         calculation_methods (Dict[str, Tuple[Callable, Dict[str, Any]]]): Map of suffixes to calculation methods.
         disconnected_calculation (bool): Flag to make the device make one and only calculation of nodes on disconnection.
+        state_version (int): Counter incremented whenever the published device state (connection status) changes.
     """
 
     def __init__(
@@ -92,6 +93,7 @@ class EnergyMeter:
         self.communication_options = communication_options
         self.connected = False
         self.network_connected = False
+        self.state_version = 0
 
         try:
             self.meter_nodes = EnergyMeterNodes(meter_type=self.meter_type, meter_options=self.meter_options, nodes=nodes)
@@ -131,6 +133,8 @@ class EnergyMeter:
         Updates the energy meter connection state.
         """
 
+        if state != self.connected:
+            self.state_version += 1
         self.connected = state
 
     def set_network_state(self, state: bool):
@@ -140,6 +144,8 @@ class EnergyMeter:
 
         self.network_connected = state
         if not state:
+            if self.connected:
+                self.state_version += 1
             self.connected = state
 
     async def process_nodes(self) -> None:
@@ -2,6 +2,12 @@
 
 import asyncio
 import logging
+import signal
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows, the stock asyncio loop is used there
+    uvloop = None
 
 #######################################
 
@@ -15,6 +21,8 @@ from web.server import HTTPServer
 from util.debug import LoggerManager
 from analytics.system import SystemMonitor
 from analytics.validation import validation_metrics
+import media.image.device_img as device_img
+from media.image.device_img import DeviceImageStorage
 
 #######################################
 
@@ -26,7 +34,8 @@ async def async_main() -> None:
     Responsibilities:
         - Initializes logging, database, MQTT, and HTTP server components.
         - Creates and registers energy meter devices.
-        - Keeps the event loop alive to support background tasks (e.g., MQTT, HTTP, write queues).
+        - Keeps the event loop alive to support background tasks (e.g., MQTT, HTTP, write queues)
+          until SIGINT/SIGTERM is received.
     """
 
     # Initialize global logger
@@ -37,11 +46,13 @@ async def async_main() -> None:
     mqtt_client = MQTTClient()
     device_manager = DeviceManager(
         enable_publish=mqtt_client.enable_publish,
-        publish_queue=mqtt_client.publish_queue,
+        publish=mqtt_client.put,
         measurements_queue=timedb_client.write_queue,
         devices_db=sqlitedb_client,
     )
     system_monitor = SystemMonitor()
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
     http_server = HTTPServer(
         device_manager=device_manager,
         db=sqlitedb_client,
@@ -50,17 +61,27 @@ async def async_main() -> None:
     )
 
     try:
+        # Forks the writer process, so it must start before the loop signal handlers are installed, otherwise the
+        # writer inherits them and ignores signals aimed at it while forwarding them to this loop
+        await system_monitor.start()
+        for stop_signal in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(stop_signal, stop_event.set)
+            except NotImplementedError:
+                pass  # Not supported by the Windows event loop, KeyboardInterrupt cancels the task instead
+        # Convert device images stored by previous versions
+        if not await loop.run_in_executor(device_img.thread_executor, DeviceImageStorage.migrate_legacy_images):
+            logger.warning("Some legacy device images could not be converted.")
         # Create core infrastructure
         await timedb_client.init_connection()
         await sqlitedb_client.init_connection()
         await device_manager.start()
         await mqtt_client.start()
         await http_server.start()
-        system_monitor.start()
         await validation_metrics.start()
-        # Keep main loop alive to support background tasks
-        while True:
-            await asyncio.sleep(2)
+        # Keep main loop alive to support background tasks until a stop signal is received
+        await stop_event.wait()
+        logger.info("Application is being shutdown by the user.")
     except asyncio.CancelledError:
         logger.info("Application is being shutdown by the user.")
     except Exception as e:
@@ -77,11 +98,12 @@ async def async_main() -> None:
         logger.debug("Shutting down Validation...")
         await validation_metrics.stop()
         logger.debug("Shutting down System Monitor...")
-        system_monitor.stop()
+        await system_monitor.stop()
         logger.debug("Shutting down HTTP server...")
         await http_server.stop()
         logger.info("Application shutdown complete.")
 
 
 if __name__ == "__main__":
-    asyncio.run(async_main())
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop if uvloop else None) as runner:
+        runner.run(async_main())
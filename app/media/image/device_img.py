@@ -1,13 +1,14 @@
 ###########EXTERNAL IMPORTS############
 
-from typing import Dict
-import base64
+from typing import Dict, Optional, ClassVar, Set
+import pybase64
 import os
 from starlette.datastructures import UploadFile
 from PIL import Image
 import shutil
-import io
 from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import threading
 
 
 #######################################
@@ -18,7 +19,8 @@ from conf.env import APP_DATA_PATH
 
 #######################################
 
-thread_executor = ThreadPoolExecutor(max_workers=4)
+# All DeviceImageStorage methods do blocking file and image work, callers run them on this executor
+thread_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="device-img")
 
 class DeviceImageStorage():
 
@@ -27,12 +29,63 @@ class DeviceImageStorage():
     IMAGE_BIN_PATH = f"{IMAGE_ROOT_PATH}/.bin"
     DEFAULT_IMAGE_SOURCE = "data/device_img/default.png"
     DEFAULT_IMAGE_PATH = f"{IMAGE_ROOT_PATH}/default.png"
-    IMAGE_EXTENSION = "png"
-    DECODE_TYPE = "utf-8"
+    IMAGE_EXTENSION = "webp"
+    ENCODED_EXTENSION = "b64" # Sidecar holding the base64 encoded image, next to each uploaded image
+    IMAGE_QUALITY = 90
+    LEGACY_IMAGE_EXTENSION = "png" # Format used to store uploaded images by previous versions
     IMAGE_SIZE = 200
+    _default_cache: ClassVar[Optional[Dict[str, str]]] = None # Encoded default image, built on first use
+    _custom_ids: ClassVar[Optional[Set[int]]] = None # Devices with an uploaded image, scanned on first use
+    _custom_ids_lock = threading.Lock()
+    _device_locks: ClassVar[Dict[int, threading.RLock]] = {} # Serializes file changes and sidecar rebuilds per device
+    _device_locks_guard = threading.Lock()
+    IMAGE_RESAMPLE_FILTER = Image.Resampling.LANCZOS # High-quality downscaling filter (BICUBIC is ~2x faster)
+    IMAGE_REDUCING_GAP = 3.0
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _image_path(device_id: int) -> str:
+        # Paths are built once per device and reused by every storage call
+        return f"{DeviceImageStorage.IMAGE_UPLOAD_PATH}/{device_id}.{DeviceImageStorage.IMAGE_EXTENSION}"
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _bin_path(device_id: int) -> str:
+        return f"{DeviceImageStorage.IMAGE_BIN_PATH}/{device_id}.{DeviceImageStorage.IMAGE_EXTENSION}"
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _encoded_path(device_id: int) -> str:
+        return f"{DeviceImageStorage._image_path(device_id)}.{DeviceImageStorage.ENCODED_EXTENSION}"
+
+    @staticmethod
+    def _device_lock(device_id: int) -> threading.RLock:
+        with DeviceImageStorage._device_locks_guard:
+            return DeviceImageStorage._device_locks.setdefault(device_id, threading.RLock())
+
+    @staticmethod
+    def _get_custom_ids() -> Set[int]:
+        if DeviceImageStorage._custom_ids is not None:
+            return DeviceImageStorage._custom_ids
+
+        # One directory scan replaces a stat per image request, mutations keep the set up to date afterwards
+        with DeviceImageStorage._custom_ids_lock:
+            if DeviceImageStorage._custom_ids is None:
+                custom_ids: Set[int] = set()
+                if os.path.isdir(DeviceImageStorage.IMAGE_UPLOAD_PATH):
+                    with os.scandir(DeviceImageStorage.IMAGE_UPLOAD_PATH) as entries:
+                        for entry in entries:
+                            name, ext = os.path.splitext(entry.name)
+                            if ext == f".{DeviceImageStorage.IMAGE_EXTENSION}" and name.isdigit() and entry.is_file():
+                                custom_ids.add(int(name))
+                DeviceImageStorage._custom_ids = custom_ids
+            return DeviceImageStorage._custom_ids
 
     @staticmethod
     def get_default_image() -> Dict[str, str]:
+        if DeviceImageStorage._default_cache is not None:
+            return DeviceImageStorage._default_cache
+
         if not os.path.exists(DeviceImageStorage.DEFAULT_IMAGE_PATH):
             os.makedirs(DeviceImageStorage.IMAGE_ROOT_PATH, exist_ok=True)
             try:
@@ -40,31 +93,86 @@ class DeviceImageStorage():
             except Exception:
                 raise ValueError(f"Couldn't initialize the default device image.")
 
-        with open(DeviceImageStorage.DEFAULT_IMAGE_PATH, "rb") as image:
-            img_data = base64.b64encode(image.read()).decode(DeviceImageStorage.DECODE_TYPE)
-            path, ext = os.path.splitext(DeviceImageStorage.DEFAULT_IMAGE_PATH)
-            img_type = f"image/{ext.lstrip('.')}"
-            return {"data": img_data, "type": img_type, "filename": f"{os.path.basename(DeviceImageStorage.DEFAULT_IMAGE_PATH)}"}
+        img_data = DeviceImageStorage.__encode_file(DeviceImageStorage.DEFAULT_IMAGE_PATH)
+        path, ext = os.path.splitext(DeviceImageStorage.DEFAULT_IMAGE_PATH)
+        img_type = f"image/{ext.lstrip('.')}"
+        DeviceImageStorage._default_cache = {"data": img_data, "type": img_type, "filename": f"{os.path.basename(DeviceImageStorage.DEFAULT_IMAGE_PATH)}"}
+        return DeviceImageStorage._default_cache
 
 
     @staticmethod
     def get_image(device_id: int) -> Dict[str, str]:
-        image_path = f"{DeviceImageStorage.IMAGE_UPLOAD_PATH}/{device_id}.{DeviceImageStorage.IMAGE_EXTENSION}"
+        image_path = DeviceImageStorage._image_path(device_id)
 
-        if os.path.exists(image_path):
-            with open(image_path, "rb") as image:
-                img_data = base64.b64encode(image.read()).decode(DeviceImageStorage.DECODE_TYPE)
-                img_type = f"image/{DeviceImageStorage.IMAGE_EXTENSION}"
-                return {"data": img_data, "type": img_type, "filename": f"{os.path.basename(image_path)}"}
+        if device_id in DeviceImageStorage._get_custom_ids():
+            encoded_path = DeviceImageStorage._encoded_path(device_id)
+            # Sidecars are only ever replaced atomically, so reading one without the lock is safe
+            img_data = DeviceImageStorage.__read_encoded(encoded_path)
+            if img_data is None:
+                # Images stored before the sidecar existed (or restored from the bin) are encoded once here,
+                # under the device lock so a concurrent save can't be encoded half-written or overwritten with stale data
+                with DeviceImageStorage._device_lock(device_id):
+                    img_data = DeviceImageStorage.__read_encoded(encoded_path)
+                    if img_data is None:
+                        try:
+                            img_data = DeviceImageStorage.__store_encoded(image_path, encoded_path)
+                        except FileNotFoundError:
+                            # Image was removed outside of the storage methods
+                            DeviceImageStorage._get_custom_ids().discard(device_id)
+                            return DeviceImageStorage.get_default_image()
+            img_type = f"image/{DeviceImageStorage.IMAGE_EXTENSION}"
+            return {"data": img_data, "type": img_type, "filename": f"{os.path.basename(image_path)}"}
             
         return DeviceImageStorage.get_default_image()
+
+    @staticmethod
+    def __encode_file(file_path: str) -> str:
+
+        # Read straight into a buffer sized from the open file and encode it without intermediate copies
+        with open(file_path, "rb", buffering=0) as file:
+            buffer = bytearray(os.fstat(file.fileno()).st_size)
+            read_size = file.readinto(buffer) or 0
+            return pybase64.b64encode_as_string(memoryview(buffer)[:read_size])
     
+    @staticmethod
+    def __read_encoded(encoded_path: str) -> Optional[str]:
+        try:
+            with open(encoded_path, "r") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def __store_encoded(image_path: str, encoded_path: str) -> str:
+
+        img_data = DeviceImageStorage.__encode_file(image_path)
+        # Written to a temporary file and renamed so readers never see a partial sidecar, the sidecar is only a cache so write errors are ignored
+        tmp_path = f"{encoded_path}.tmp"
+        try:
+            with open(tmp_path, "w") as file:
+                file.write(img_data)
+            os.replace(tmp_path, encoded_path)
+        except OSError:
+            pass
+        return img_data
+
+    @staticmethod
+    def __remove_encoded(device_id: int) -> None:
+        try:
+            os.remove(DeviceImageStorage._encoded_path(device_id))
+        except FileNotFoundError:
+            pass
+
     @staticmethod
     def __process_image(image: UploadFile, size_px: int) -> Image.Image:
 
-        image_data = image.file.read()
+        # PIL reads straight from the uploaded (spooled) file, no in-memory copy of the upload is made
+        image.file.seek(0)
+        with Image.open(image.file) as img:
 
-        with Image.open(io.BytesIO(image_data)) as img:
+            # Let libjpeg decode at a reduced DCT scale, keeping at least twice the target size for the final resize
+            if img.format == "JPEG":
+                img.draft("RGB", (size_px * 2, size_px * 2))
 
             # If image is in palette (indexed colors) format convert it to RGBA
             if img.mode == "P":
@@ -79,10 +187,10 @@ class DeviceImageStorage():
                 new_height = size_px
                 new_width = int((width * size_px) / height)
 
-            # High-quality downscaling filter
-            RESAMPLE_FILTER = Image.Resampling.LANCZOS
-
-            return img.resize((new_width, new_height), RESAMPLE_FILTER)
+            # Box-reduce large images first so the resample filter only runs over ~3x the target size
+            return img.resize(
+                (new_width, new_height), DeviceImageStorage.IMAGE_RESAMPLE_FILTER, reducing_gap=DeviceImageStorage.IMAGE_REDUCING_GAP
+            )
             
     @staticmethod
     def save_image(device_id: int, image: UploadFile, existing_to_bin: bool = False) -> bool:
@@ -90,21 +198,36 @@ class DeviceImageStorage():
         if not image.content_type or not image.content_type.startswith("image/"):
             return False
         
+        tmp_path: Optional[str] = None
         try:
             os.makedirs(DeviceImageStorage.IMAGE_UPLOAD_PATH, exist_ok=True)
             if existing_to_bin:
                 os.makedirs(DeviceImageStorage.IMAGE_BIN_PATH, exist_ok=True)
             processed_image = DeviceImageStorage.__process_image(image, DeviceImageStorage.IMAGE_SIZE)
-            image_path = os.path.join(DeviceImageStorage.IMAGE_UPLOAD_PATH, f"{device_id}.{DeviceImageStorage.IMAGE_EXTENSION}")
-            if existing_to_bin and os.path.exists(image_path):
-                # Moves existing image to bin
-                bin_path = os.path.join(DeviceImageStorage.IMAGE_BIN_PATH, f"{device_id}.{DeviceImageStorage.IMAGE_EXTENSION}")
-                shutil.move(image_path, bin_path)
-            processed_image.save(image_path, format=DeviceImageStorage.IMAGE_EXTENSION.upper(), optimize=True)
+            image_path = DeviceImageStorage._image_path(device_id)
+            # Encoded to a per-thread temporary file first, readers only ever see a complete image
+            tmp_path = f"{image_path}.{threading.get_ident()}.tmp"
+            processed_image.save(tmp_path, format=DeviceImageStorage.IMAGE_EXTENSION.upper(), quality=DeviceImageStorage.IMAGE_QUALITY, method=4)
+            with DeviceImageStorage._device_lock(device_id):
+                # Drop the encoded copy first so a failed save can never leave it out of date
+                DeviceImageStorage.__remove_encoded(device_id)
+                if existing_to_bin and os.path.exists(image_path):
+                    # Moves existing image to bin
+                    bin_path = DeviceImageStorage._bin_path(device_id)
+                    shutil.move(image_path, bin_path)
+                os.replace(tmp_path, image_path)
+                tmp_path = None
+                DeviceImageStorage.__store_encoded(image_path, DeviceImageStorage._encoded_path(device_id))
+                DeviceImageStorage._get_custom_ids().add(device_id)
             return True
         except Exception as e:
             return False
         finally:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
             # moves image pointer to the beggining so other methods can use the file
             image.file.seek(0)
 
@@ -113,44 +236,70 @@ class DeviceImageStorage():
     def delete_image(device_id: int, move_to_bin: bool = False) -> bool:
 
         try:
-            image_path = os.path.join(DeviceImageStorage.IMAGE_UPLOAD_PATH, f"{device_id}.{DeviceImageStorage.IMAGE_EXTENSION}")
-            if os.path.exists(image_path):
-                if move_to_bin:
-                    bin_path = os.path.join(DeviceImageStorage.IMAGE_BIN_PATH, f"{device_id}.{DeviceImageStorage.IMAGE_EXTENSION}")
-                    shutil.move(image_path, bin_path)
-                else:
-                    os.remove(image_path)
-                return True
-            else:
-                return True
+            image_path = DeviceImageStorage._image_path(device_id)
+            with DeviceImageStorage._device_lock(device_id):
+                DeviceImageStorage.__remove_encoded(device_id)
+                DeviceImageStorage._get_custom_ids().discard(device_id)
+                if os.path.exists(image_path):
+                    if move_to_bin:
+                        bin_path = DeviceImageStorage._bin_path(device_id)
+                        shutil.move(image_path, bin_path)
+                    else:
+                        os.remove(image_path)
+            return True
         except Exception as e:
             return False
 
     @staticmethod
     def rollback_image(device_id: int) -> bool:
 
-        image_path = os.path.join(DeviceImageStorage.IMAGE_UPLOAD_PATH, f"{device_id}.{DeviceImageStorage.IMAGE_EXTENSION}")
-        bin_path = os.path.join(DeviceImageStorage.IMAGE_BIN_PATH, f"{device_id}.{DeviceImageStorage.IMAGE_EXTENSION}")
+        image_path = DeviceImageStorage._image_path(device_id)
+        bin_path = DeviceImageStorage._bin_path(device_id)
 
         try:
-            if os.path.exists(DeviceImageStorage.IMAGE_UPLOAD_PATH) and not os.path.exists(image_path) and os.path.exists(bin_path):
-                DeviceImageStorage.delete_image(device_id)
-                shutil.move(bin_path, image_path)
-                return True
-            else:
-                return True
+            with DeviceImageStorage._device_lock(device_id):
+                if os.path.exists(DeviceImageStorage.IMAGE_UPLOAD_PATH) and not os.path.exists(image_path) and os.path.exists(bin_path):
+                    DeviceImageStorage.delete_image(device_id)
+                    shutil.move(bin_path, image_path)
+                    DeviceImageStorage._get_custom_ids().add(device_id)
+            return True
         except Exception as e:
             return False
         
+    @staticmethod
+    def migrate_legacy_images() -> bool:
+
+        # Re-encodes images stored in the legacy format (uploads and bin) to the current storage format
+        success = True
+        for directory in (DeviceImageStorage.IMAGE_UPLOAD_PATH, DeviceImageStorage.IMAGE_BIN_PATH):
+            if not os.path.isdir(directory):
+                continue
+            for filename in os.listdir(directory):
+                name, ext = os.path.splitext(filename)
+                if ext.lower() != f".{DeviceImageStorage.LEGACY_IMAGE_EXTENSION}":
+                    continue
+                legacy_path = os.path.join(directory, filename)
+                image_path = os.path.join(directory, f"{name}.{DeviceImageStorage.IMAGE_EXTENSION}")
+                try:
+                    with Image.open(legacy_path) as img:
+                        img.save(image_path, format=DeviceImageStorage.IMAGE_EXTENSION.upper(), quality=DeviceImageStorage.IMAGE_QUALITY, method=4)
+                    os.remove(legacy_path)
+                except Exception as e:
+                    success = False
+        # Converted uploads are picked up by the next scan
+        DeviceImageStorage._custom_ids = None
+        return success
+
     @staticmethod
     def flush_bin() -> bool:
 
         try:
             if os.path.exists(DeviceImageStorage.IMAGE_BIN_PATH):
-                for filename in os.listdir(DeviceImageStorage.IMAGE_BIN_PATH):
-                    file_path = os.path.join(DeviceImageStorage.IMAGE_BIN_PATH, filename)
-                    if os.path.isfile(file_path):
-                        os.remove(file_path)
+                # scandir entries carry the file type, so no extra stat is needed per file
+                with os.scandir(DeviceImageStorage.IMAGE_BIN_PATH) as entries:
+                    for entry in entries:
+                        if entry.is_file(follow_symlinks=False):
+                            os.unlink(entry.path)
                 return True
             else:
                 return True
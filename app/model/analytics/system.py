@@ -10,7 +10,7 @@ from typing import Dict, Union, Optional
 #######################################
 
 
-@dataclass
+@dataclass(slots=True)
 class DiskMetrics:
     """
     Container for disk performance metrics.
@@ -37,7 +37,7 @@ class DiskMetrics:
     io_valid: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class RealTimeSystemData:
     """
     Container for the latest real-time system metrics snapshot.
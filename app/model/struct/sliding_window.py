@@ -1,7 +1,6 @@
 ###########EXTERNAL IMPORTS############
 
-from collections import deque
-from typing import TypeVar, Generic, Deque, List
+from typing import TypeVar, Generic, List, Optional
 
 #######################################
 
@@ -18,11 +17,24 @@ class SlidingWindow(Generic[T]):
 
     Maintains the most recent items up to a maximum size, automatically
     discarding the oldest entries when new items are added.
+
+    Items are stored in a preallocated ring buffer indexed by a write
+    cursor, so adding an item is O(1) and does not allocate once the
+    window is full.
     """
 
+    __slots__ = ("_buf", "_idx", "_size", "max_size")
+
     def __init__(self, max_size: int) -> None:
+        if max_size <= 0:
+            raise ValueError("Sliding window max size must be positive.")
         self.max_size = max_size
-        self.items: Deque[T] = deque(maxlen=max_size)
+        self._buf: List[Optional[T]] = [None] * max_size
+        self._idx = 0  # Position where the next item is written
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
 
     def add(self, item: T) -> None:
         """
@@ -32,20 +44,31 @@ class SlidingWindow(Generic[T]):
         the oldest item is discarded.
         """
 
-        self.items.appendleft(item)
+        self._buf[self._idx] = item
+        self._idx = (self._idx + 1) % self.max_size
+        if self._size < self.max_size:
+            self._size += 1
 
     def peek(self, index: int = 0) -> T:
         """
         Returns an item without removing it.
 
         Args:
-            index: Position in the window (0 = most recent).
+            index: Position in the window (0 = most recent, -1 = oldest).
 
         Returns:
             The requested item.
+
+        Raises:
+            IndexError: If the index is out of range.
         """
 
-        return self.items[index]
+        if index < 0:
+            index += self._size
+        if index < 0 or index >= self._size:
+            raise IndexError("Sliding window index out of range")
+
+        return self._buf[(self._idx - 1 - index) % self.max_size]  # type: ignore[return-value]
 
     def pop_left(self) -> T:
         """
@@ -53,9 +76,19 @@ class SlidingWindow(Generic[T]):
 
         Returns:
             The most recently added item.
+
+        Raises:
+            IndexError: If the window is empty.
         """
 
-        return self.items.popleft()
+        if self._size == 0:
+            raise IndexError("pop from an empty sliding window")
+
+        self._idx = (self._idx - 1) % self.max_size
+        item = self._buf[self._idx]
+        self._buf[self._idx] = None
+        self._size -= 1
+        return item  # type: ignore[return-value]
 
     def pop_right(self) -> T:
         """
@@ -63,9 +96,19 @@ class SlidingWindow(Generic[T]):
 
         Returns:
             The oldest item in the window.
+
+        Raises:
+            IndexError: If the window is empty.
         """
 
-        return self.items.pop()
+        if self._size == 0:
+            raise IndexError("pop from an empty sliding window")
+
+        oldest = (self._idx - self._size) % self.max_size
+        item = self._buf[oldest]
+        self._buf[oldest] = None
+        self._size -= 1
+        return item  # type: ignore[return-value]
 
     def get_list(self) -> List[T]:
         """
@@ -75,4 +118,6 @@ class SlidingWindow(Generic[T]):
             A list of items ordered from most recent to oldest.
         """
 
-        return list(self.items)
+        items = (self._buf[self._idx :] + self._buf[: self._idx])[self.max_size - self._size :]
+        items.reverse()
+        return items  # type: ignore[return-value]
@@ -2,11 +2,11 @@
 
 import asyncio
 import ssl
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from dataclasses import dataclass, replace
+from typing import Optional, Dict, Any, List, Union, Tuple, ClassVar
 import os
 import aiomqtt.client as mqtt
-import json
+import orjson
 
 #######################################
 
@@ -19,6 +19,8 @@ from conf.env import APP_DATA_PATH
 
 #######################################
 
+logger = LoggerManager.get_logger(__name__)
+
 
 @dataclass
 class MQTTMessage:
@@ -36,6 +38,22 @@ class MQTTMessage:
     payload: Dict
 
 
+@dataclass
+class MQTTMessageBatch:
+    """
+    Group of MQTT messages queued as a single publish queue item.
+
+    Used to coalesce messages produced in a short time window so they
+    cost one queue operation instead of one per message. Messages are
+    published in list order.
+
+    Attributes:
+        messages (List[MQTTMessage]): Messages to publish.
+    """
+
+    messages: List[MQTTMessage]
+
+
 @dataclass
 class MQTTClientConfig:
     """
@@ -70,12 +88,18 @@ class MQTTClient:
     """
 
     CLIENT_CONFIG_PATH = str(f"{APP_DATA_PATH}/mqtt.json")
+    PUBLISH_BATCH_SIZE = 64  # Maximum queue items drained and published per event loop turn
+    PUBLISH_QUEUE_SIZE = 1000
+    _config_cache: ClassVar[Optional[Tuple[Tuple[int, int], MQTTClientConfig]]] = None  # ((mtime_ns, size), config)
 
     @staticmethod
     def get_config() -> MQTTClientConfig:
         """
         Loads the environment and validates required MQTT settings.
 
+        The parsed configuration is cached and only reloaded when the
+        configuration file modification time or size changes.
+
         Args:
             config_file (str): Path to the .env config file.
 
@@ -84,13 +108,20 @@ class MQTTClient:
         """
 
         # Checks if configuration file exists
-        if not os.path.exists(MQTTClient.CLIENT_CONFIG_PATH):
+        try:
+            stat = os.stat(MQTTClient.CLIENT_CONFIG_PATH)
+        except FileNotFoundError:
             return MQTTClientConfig(enabled=False)
 
+        file_version = (stat.st_mtime_ns, stat.st_size)
+        cache = MQTTClient._config_cache
+        if cache is not None and cache[0] == file_version:
+            return replace(cache[1])
+
         # Obtain user configuration
-        with open(MQTTClient.CLIENT_CONFIG_PATH, "r") as file:
-            config: Dict[str, Any] = json.load(file)
-            return MQTTClientConfig(
+        with open(MQTTClient.CLIENT_CONFIG_PATH, "rb") as file:
+            config: Dict[str, Any] = orjson.loads(file.read())
+            client_config = MQTTClientConfig(
                 enabled=config.get("enabled", False),
                 cert_path=config.get("cert_path", None),
                 hostname=config.get("hostname", None),
@@ -101,6 +132,8 @@ class MQTTClient:
                 password=config.get("password", None),
                 pass_key=config.get("pass_key", None),
             )
+        MQTTClient._config_cache = (file_version, client_config)
+        return replace(client_config)
 
     @staticmethod
     def validate_config(config: MQTTClientConfig) -> None:
@@ -137,7 +170,9 @@ class MQTTClient:
         self.config = MQTTClient.get_config()
         MQTTClient.validate_config(self.config)
         self.enable_publish = asyncio.Event()
-        self.publish_queue: asyncio.Queue[MQTTMessage] = asyncio.Queue(maxsize=1000)
+        self.publish_queue: asyncio.Queue[Union[MQTTMessage, MQTTMessageBatch]] = asyncio.Queue(
+            maxsize=self.PUBLISH_QUEUE_SIZE
+        )
         self.publish_task: Optional[asyncio.Task] = None
         self.client: Optional[mqtt.Client] = None
 
@@ -152,8 +187,6 @@ class MQTTClient:
         if self.client is not None or self.publish_task is not None:
             raise RuntimeError("Client or publish task are already instantiated")
 
-        loop = asyncio.get_event_loop()
-
         tls_context = None
         if self.config.cert_path is not None:
             tls_context = ssl.create_default_context()
@@ -175,7 +208,7 @@ class MQTTClient:
                 identifier=self.config.id,
                 tls_context=tls_context,
             )
-        self.publish_task = loop.create_task(self.publisher())
+        self.publish_task = asyncio.create_task(self.publisher())
         self.enable_publish.set()
 
     async def stop(self) -> None:
@@ -216,10 +249,13 @@ class MQTTClient:
         Upon the first successful connection, clears any queued messages
         to avoid publishing stale device state.
 
+        After each wake-up, every item already waiting in the queue (up to
+        `PUBLISH_BATCH_SIZE`) is drained and the whole batch is published
+        concurrently, instead of one queue round-trip per message.
+
         This method runs indefinitely in the background.
         """
 
-        logger = LoggerManager.get_logger(__name__)
         mqtt_client = self.__require_client()
 
         while True:
@@ -228,23 +264,60 @@ class MQTTClient:
                     logger.info("Connected to the MQTT broker.")
                     self.clear_queue()
                     while True:
-                        message: MQTTMessage = await self.publish_queue.get()
-                        await client.publish(topic=message.topic, payload=json.dumps(message.payload), qos=message.qos)
-                        logger.debug(f"Published to topic {message.topic}")
+                        items = [await self.publish_queue.get()]
+                        while len(items) < self.PUBLISH_BATCH_SIZE:
+                            try:
+                                items.append(self.publish_queue.get_nowait())
+                            except asyncio.QueueEmpty:
+                                break
+
+                        messages: List[MQTTMessage] = []
+                        for item in items:
+                            if isinstance(item, MQTTMessageBatch):
+                                messages.extend(item.messages)
+                            else:
+                                messages.append(item)
+
+                        await asyncio.gather(
+                            *(
+                                client.publish(
+                                    topic=message.topic,
+                                    payload=orjson.dumps(message.payload, option=orjson.OPT_NON_STR_KEYS),
+                                    qos=message.qos,
+                                )
+                                for message in messages
+                            )
+                        )
+                        logger.debug(f"Published {len(messages)} messages")
             except Exception as e:
                 logger.error(f"MQTT publish task error: {e}")
                 await asyncio.sleep(2)
 
+    def put(self, message: Union[MQTTMessage, MQTTMessageBatch]) -> None:
+        """
+        Queues a message (or batch of messages) for publishing.
+
+        Producers must go through this method instead of holding a reference
+        to `publish_queue`, as the queue is replaced when cleared. If the
+        queue is full (e.g. the broker is unreachable), the message is
+        dropped, since only the latest device state is relevant.
+
+        Args:
+            message: Message or batch of messages to publish.
+        """
+
+        try:
+            self.publish_queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.debug("MQTT publish queue is full, dropping message.")
+
     def clear_queue(self) -> None:
         """
         Clears all pending messages from the publish queue.
 
         Intended to be called right after a (re)connection to the MQTT broker,
-        to prevent publishing outdated or irrelevant messages.
+        to prevent publishing outdated or irrelevant messages. The queue is
+        replaced with an empty one instead of being drained item by item.
         """
 
-        while not self.publish_queue.empty():
-            try:
-                self.publish_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
+        self.publish_queue = asyncio.Queue(maxsize=self.PUBLISH_QUEUE_SIZE)
@@ -0,0 +1,144 @@
+###########EXTERNAL IMPORTS############
+
+import io
+import os
+import pybase64
+import pytest
+from PIL import Image
+from starlette.datastructures import Headers, UploadFile
+
+#######################################
+
+#############LOCAL IMPORTS#############
+
+from media.image.device_img import DeviceImageStorage
+
+#######################################
+
+DEFAULT_IMAGE_SOURCE = os.path.join(os.path.dirname(__file__), "..", "data", "device_img", "default.png")
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    root = tmp_path / "device_img"
+    monkeypatch.setattr(DeviceImageStorage, "IMAGE_ROOT_PATH", str(root))
+    monkeypatch.setattr(DeviceImageStorage, "IMAGE_UPLOAD_PATH", str(root / "upload"))
+    monkeypatch.setattr(DeviceImageStorage, "IMAGE_BIN_PATH", str(root / ".bin"))
+    monkeypatch.setattr(DeviceImageStorage, "DEFAULT_IMAGE_SOURCE", DEFAULT_IMAGE_SOURCE)
+    monkeypatch.setattr(DeviceImageStorage, "DEFAULT_IMAGE_PATH", str(root / "default.png"))
+    monkeypatch.setattr(DeviceImageStorage, "_custom_ids", None)
+    monkeypatch.setattr(DeviceImageStorage, "_default_cache", None)
+    clear_path_caches()
+    yield DeviceImageStorage
+    clear_path_caches()
+
+
+def clear_path_caches() -> None:
+    # Paths are memoized per device id, so they must not outlive the patched roots
+    for cached_path in (DeviceImageStorage._image_path, DeviceImageStorage._bin_path, DeviceImageStorage._encoded_path):
+        cached_path.cache_clear()
+
+
+def png_bytes(color: str, size=(400, 300)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def upload(data: bytes, content_type: str = "image/png") -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="image.png", headers=Headers({"content-type": content_type}))
+
+
+def file_b64(path: str) -> str:
+    with open(path, "rb") as file:
+        return pybase64.b64encode_as_string(file.read())
+
+
+def test_save_and_read_from_sidecar(storage):
+    assert storage.save_image(1, upload(png_bytes("red")))
+
+    image_path = storage._image_path(1)
+    encoded_path = storage._encoded_path(1)
+    with Image.open(image_path) as img:
+        assert img.format == "WEBP"
+        assert min(img.size) == storage.IMAGE_SIZE
+    assert 1 in storage._get_custom_ids()
+
+    image = storage.get_image(1)
+    assert image == {"data": file_b64(image_path), "type": "image/webp", "filename": "1.webp"}
+
+    # Served from the sidecar, not re-encoded from the image
+    with open(encoded_path, "w") as file:
+        file.write("cached")
+    assert storage.get_image(1)["data"] == "cached"
+
+    # A missing sidecar is rebuilt from the image
+    os.remove(encoded_path)
+    assert storage.get_image(1)["data"] == file_b64(image_path)
+    assert os.path.exists(encoded_path)
+
+
+def test_save_rejects_non_images(storage):
+    assert not storage.save_image(1, upload(b"not an image"))
+    assert not storage.save_image(1, upload(png_bytes("red"), content_type="text/plain"))
+    assert 1 not in storage._get_custom_ids()
+    assert storage.get_image(1)["filename"] == "default.png"
+    assert not [name for name in os.listdir(storage.IMAGE_UPLOAD_PATH) if name.endswith(".tmp")]
+
+
+def test_delete_image(storage):
+    assert storage.save_image(1, upload(png_bytes("red")))
+    assert storage.delete_image(1)
+
+    assert not os.path.exists(storage._image_path(1))
+    assert not os.path.exists(storage._encoded_path(1))
+    assert 1 not in storage._get_custom_ids()
+    assert storage.get_image(1) == storage.get_default_image()
+
+
+def test_rollback_after_failed_write(storage, monkeypatch):
+    assert storage.save_image(1, upload(png_bytes("red")))
+    original = storage.get_image(1)["data"]
+
+    image_path = storage._image_path(1)
+    replace = os.replace
+
+    def failing_replace(src, dst):
+        if dst == image_path:
+            raise OSError("disk full")
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", failing_replace)
+    assert not storage.save_image(1, upload(png_bytes("blue")), existing_to_bin=True)
+    monkeypatch.setattr(os, "replace", replace)
+
+    # The old image was moved to the bin and its sidecar dropped before the write failed
+    assert not os.path.exists(image_path)
+    assert not os.path.exists(storage._encoded_path(1))
+    assert os.path.exists(storage._bin_path(1))
+
+    assert storage.rollback_image(1)
+    assert storage.get_image(1)["data"] == original
+    assert 1 in storage._get_custom_ids()
+
+
+def test_migrate_legacy_images(storage):
+    os.makedirs(storage.IMAGE_UPLOAD_PATH)
+    os.makedirs(storage.IMAGE_BIN_PATH)
+    with open(os.path.join(storage.IMAGE_UPLOAD_PATH, "7.png"), "wb") as file:
+        file.write(png_bytes("green", size=(200, 200)))
+    with open(os.path.join(storage.IMAGE_BIN_PATH, "8.png"), "wb") as file:
+        file.write(png_bytes("green", size=(200, 200)))
+    assert storage._get_custom_ids() == set()
+
+    assert storage.migrate_legacy_images()
+
+    assert sorted(os.listdir(storage.IMAGE_UPLOAD_PATH)) == ["7.webp"]
+    assert sorted(os.listdir(storage.IMAGE_BIN_PATH)) == ["8.webp"]
+    assert storage._get_custom_ids() == {7}  # Rescanned after the migration
+    assert storage.get_image(7)["type"] == "image/webp"
+
+    with open(os.path.join(storage.IMAGE_UPLOAD_PATH, "9.png"), "wb") as file:
+        file.write(b"corrupt")
+    assert not storage.migrate_legacy_images()
+    assert os.path.exists(os.path.join(storage.IMAGE_UPLOAD_PATH, "9.png"))
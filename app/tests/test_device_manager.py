@@ -0,0 +1,130 @@
+###########EXTERNAL IMPORTS############
+
+import asyncio
+import types
+from typing import List, Optional, Set, Union
+import pytest
+
+#######################################
+
+#############LOCAL IMPORTS#############
+
+from controller.manager import DeviceManager
+from controller.meter.device import EnergyMeter
+from controller.node.node import Node, BaseNodeProtocolOptions
+from model.controller.general import Protocol
+from model.controller.device import EnergyMeterType
+from model.controller.node import NodeType, NodeConfig
+from mqtt.client import MQTTMessage, MQTTMessageBatch
+
+#######################################
+
+
+class DummyMeter(EnergyMeter):
+    def __init__(self, id: int, name: str, nodes: Optional[Set[Node]] = None):
+        self.id = id
+        self.name = name
+        self.protocol = Protocol.MODBUS_RTU
+        self.meter_type = EnergyMeterType.THREE_PHASE
+        self.measurements_queue = None
+        self.last_seen_update = None
+        self.publish_data = None
+        self.connected = True
+        self.network_connected = True
+        self.state_version = 0
+        self.meter_nodes = types.SimpleNamespace(nodes={n.config.name: n for n in nodes or ()})
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+
+def make_manager(published: List[Union[MQTTMessage, MQTTMessageBatch]]) -> DeviceManager:
+    enable_publish = asyncio.Event()
+    enable_publish.set()
+    return DeviceManager(
+        enable_publish=enable_publish,
+        publish=published.append,
+        measurements_queue=asyncio.Queue(),
+        devices_db=types.SimpleNamespace(update_device_last_seen=None),
+    )
+
+
+def published_node(name: str, value: float) -> Node:
+    node = Node(NodeConfig(name, NodeType.FLOAT, "V", publish=True), BaseNodeProtocolOptions())
+    node.processor.set_value(value)
+    return node
+
+
+@pytest.mark.asyncio
+async def test_devices_state_cache_follows_connection_state():
+    published: List[Union[MQTTMessage, MQTTMessageBatch]] = []
+    manager = make_manager(published)
+    meter = DummyMeter(1, "meter")
+    manager.devices[meter.id] = meter
+
+    await manager.publish_devices_state()
+    await manager.publish_devices_state()
+    assert published[0].payload[1]["connected"] is True
+    assert published[1].payload[1] is published[0].payload[1]  # Unchanged state reuses the cached entry
+
+    meter.set_connection_state(False)
+    await manager.publish_devices_state()
+    assert published[-1].payload[1]["connected"] is False
+
+    meter.set_connection_state(True)
+    await manager.publish_devices_state()
+    assert published[-1].payload[1]["connected"] is True
+
+    meter.set_network_state(False)
+    await manager.publish_devices_state()
+    assert published[-1].payload[1]["connected"] is False
+
+
+@pytest.mark.asyncio
+async def test_devices_state_cache_dropped_when_device_is_replaced():
+    published: List[Union[MQTTMessage, MQTTMessageBatch]] = []
+    manager = make_manager(published)
+    old_meter = DummyMeter(1, "old")
+    await manager.add_device(old_meter)
+    await manager.publish_devices_state()
+    assert published[-1].payload[1]["name"] == "old"
+
+    # API edit flow: same id and same (initial) state version on the new instance
+    await manager.delete_device(old_meter)
+    await manager.add_device(DummyMeter(1, "new"))
+    await manager.publish_devices_state()
+    assert published[-1].payload[1]["name"] == "new"
+
+    await manager.delete_device(manager.devices[1])
+
+
+@pytest.mark.asyncio
+async def test_device_data_publishes_coalesce_into_one_batch():
+    published: List[Union[MQTTMessage, MQTTMessageBatch]] = []
+    manager = make_manager(published)
+    voltage = published_node("voltage", 1.0)
+    first_meter = DummyMeter(1, "first", {voltage})
+    second_meter = DummyMeter(2, "second", {published_node("voltage", 230.0)})
+    flush_task = asyncio.create_task(manager.flush_device_data())
+    try:
+        await manager.publish_device_data(first_meter)
+        voltage.processor.set_value(2.0)
+        await manager.publish_device_data(first_meter)
+        await manager.publish_device_data(second_meter)
+        voltage.processor.set_value(3.0)
+        await manager.publish_device_data(first_meter)
+
+        await asyncio.sleep(DeviceManager.PUBLISH_COALESCE_SECONDS * 4)
+
+        assert len(published) == 1
+        batch = published[0]
+        assert isinstance(batch, MQTTMessageBatch)
+        assert [message.topic for message in batch.messages] == ["devices/1/nodes", "devices/2/nodes"]
+        assert batch.messages[0].payload == {"voltage": voltage.get_publish_format()}  # Latest update wins
+    finally:
+        flush_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flush_task
@@ -0,0 +1,106 @@
+###########EXTERNAL IMPORTS############
+
+import asyncio
+from typing import List
+import pytest
+
+#######################################
+
+#############LOCAL IMPORTS#############
+
+from mqtt.client import MQTTClient, MQTTMessage, MQTTMessageBatch
+
+#######################################
+
+
+class GatedBroker:
+    """Stand-in for the aiomqtt client whose publishes block until the gate is opened."""
+
+    def __init__(self):
+        self.published: List[str] = []
+        self.gate = asyncio.Event()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def publish(self, topic: str, payload: bytes, qos: int) -> None:
+        self.published.append(topic)
+        await self.gate.wait()
+
+
+def make_client(monkeypatch, tmp_path, queue_size: int = MQTTClient.PUBLISH_QUEUE_SIZE) -> MQTTClient:
+    monkeypatch.setattr(MQTTClient, "CLIENT_CONFIG_PATH", str(tmp_path / "mqtt.json"))  # Missing, MQTT disabled
+    monkeypatch.setattr(MQTTClient, "PUBLISH_QUEUE_SIZE", queue_size)
+    return MQTTClient()
+
+
+def message(topic: str) -> MQTTMessage:
+    return MQTTMessage(qos=0, topic=topic, payload={})
+
+
+async def start_publisher(client: MQTTClient, broker: GatedBroker) -> asyncio.Task:
+    client.client = broker  # type: ignore[assignment]
+    task = asyncio.create_task(client.publisher())
+    await asyncio.sleep(0)  # Connected and waiting on the queue
+    return task
+
+
+async def wait_published(broker: GatedBroker, count: int) -> None:
+    while len(broker.published) < count:
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_put_drops_messages_when_queue_is_full(monkeypatch, tmp_path):
+    client = make_client(monkeypatch, tmp_path, queue_size=2)
+
+    for topic in ("a", "b", "c"):
+        client.put(message(topic))
+
+    assert client.publish_queue.qsize() == 2
+    assert [client.publish_queue.get_nowait().topic for _ in range(2)] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_publisher_keeps_order_within_a_batch(monkeypatch, tmp_path):
+    client = make_client(monkeypatch, tmp_path)
+    broker = GatedBroker()
+    task = await start_publisher(client, broker)
+    try:
+        client.put(message("a"))
+        client.put(MQTTMessageBatch(messages=[message("b"), message("c")]))
+        client.put(message("d"))
+
+        await asyncio.wait_for(wait_published(broker, 4), timeout=1)
+        # Every publish started while the gate is closed, so all four went out in one drained batch
+        assert broker.published == ["a", "b", "c", "d"]
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+@pytest.mark.asyncio
+async def test_clear_queue_during_drain_keeps_batch_in_flight(monkeypatch, tmp_path):
+    client = make_client(monkeypatch, tmp_path)
+    broker = GatedBroker()
+    task = await start_publisher(client, broker)
+    try:
+        client.put(message("in-flight"))
+        await asyncio.wait_for(wait_published(broker, 1), timeout=1)
+
+        client.put(message("stale"))
+        client.clear_queue()
+        client.put(message("fresh"))
+        broker.gate.set()
+
+        await asyncio.wait_for(wait_published(broker, 2), timeout=1)
+        await asyncio.sleep(0)
+        assert broker.published == ["in-flight", "fresh"]
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
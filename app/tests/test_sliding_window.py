@@ -0,0 +1,46 @@
+###########EXTERNAL IMPORTS############
+
+import pytest
+
+#######################################
+
+#############LOCAL IMPORTS#############
+
+from model.struct.sliding_window import SlidingWindow
+
+#######################################
+
+
+def test_window_keeps_most_recent_items():
+    window: SlidingWindow[int] = SlidingWindow(max_size=3)
+    assert window.get_list() == []
+
+    for value in range(5):
+        window.add(value)
+
+    assert len(window) == 3
+    assert window.get_list() == [4, 3, 2]
+    assert window.peek() == 4
+    assert window.peek(-1) == 2
+    with pytest.raises(IndexError):
+        window.peek(3)
+
+
+def test_window_pops_from_both_ends():
+    window: SlidingWindow[int] = SlidingWindow(max_size=4)
+    for value in range(6):
+        window.add(value)
+
+    assert window.pop_left() == 5
+    assert window.pop_right() == 2
+    assert window.get_list() == [4, 3]
+
+    window.add(6)
+    assert window.get_list() == [6, 4, 3]
+
+    window.pop_left()
+    window.pop_left()
+    window.pop_left()
+    assert window.get_list() == []
+    with pytest.raises(IndexError):
+        window.pop_right()
@@ -0,0 +1,144 @@
+###########EXTERNAL IMPORTS############
+
+import asyncio
+from typing import Any, Dict, List
+import pytest
+
+#######################################
+
+#############LOCAL IMPORTS#############
+
+import web.sse.decorator as sse_decorator
+from web.broadcast import BroadcastService
+from web.middleware import SSESessionMiddleware
+from web.sse.decorator import sse_generator, SSE_UNAUTHORIZED_FRAME
+
+#######################################
+
+
+class DummyRequest:
+    """Minimal request exposing the ASGI receive channel used to detect disconnects."""
+
+    def __init__(self):
+        self.disconnected = asyncio.Event()
+
+    async def receive(self) -> Dict[str, Any]:
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+
+class DummySafety:
+    def __init__(self, active: bool = True):
+        self.active = active
+
+    def is_session_active(self, request) -> bool:
+        return self.active
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_coalesces_updates_for_slow_subscriber():
+    service = BroadcastService()
+    signal = asyncio.Event()
+    await service.register_broadcaster("system", signal)
+    broadcaster = await service.get_broadcaster("system")
+    fast = await broadcaster.subscribe()
+    slow = await broadcaster.subscribe()
+    fast.clear()
+    slow.clear()
+    try:
+        for _ in range(3):
+            signal.set()
+            await asyncio.wait_for(fast.wait(), timeout=1)
+            fast.clear()
+
+        assert broadcaster.version == 3
+        # The slow subscriber is not queued behind: it sees a single pending update at the latest version
+        assert slow.is_set()
+        slow.clear()
+        assert not slow.is_set()
+    finally:
+        await service.shutdown()
+
+    assert not broadcaster.active
+    assert not broadcaster.subscriptions
+
+
+@pytest.mark.asyncio
+async def test_subscriptions_released_on_disconnect():
+    service = BroadcastService()
+    signal = asyncio.Event()
+    await service.register_broadcaster("system", signal)
+    broadcaster = await service.get_broadcaster("system")
+    requests = [DummyRequest(), DummyRequest()]
+    streams = [sse_generator(request, DummySafety(), broadcaster, lambda: {"value": 1}) for request in requests]
+    try:
+        for stream in streams:
+            assert await asyncio.wait_for(anext(stream), timeout=1) == b'data: {"value":1}\n\n'
+        assert len(broadcaster.subscriptions) == 2
+
+        for request, stream in zip(requests, streams):
+            request.disconnected.set()
+            with pytest.raises(StopAsyncIteration):
+                await asyncio.wait_for(anext(stream), timeout=1)
+
+        assert len(broadcaster.subscriptions) == 0
+    finally:
+        await service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_stream_ends_when_session_expires(monkeypatch):
+    monkeypatch.setattr(sse_decorator, "SESSION_CHECK_INTERVAL", 0.0)
+    service = BroadcastService()
+    await service.register_broadcaster("system", asyncio.Event())
+    broadcaster = await service.get_broadcaster("system")
+    safety = DummySafety()
+    stream = sse_generator(DummyRequest(), safety, broadcaster, lambda: [1], heartbeat_interval=0.01)
+    try:
+        assert await asyncio.wait_for(anext(stream), timeout=1) == b"data: [1]\n\n"
+
+        safety.active = False
+        assert await asyncio.wait_for(anext(stream), timeout=1) == SSE_UNAUTHORIZED_FRAME
+        with pytest.raises(StopAsyncIteration):
+            await anext(stream)
+        assert len(broadcaster.subscriptions) == 0
+    finally:
+        await service.shutdown()
+
+
+async def call_middleware(middleware: SSESessionMiddleware, path: str) -> List[Dict[str, Any]]:
+    sent: List[Dict[str, Any]] = []
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b""}
+
+    async def send(message: Dict[str, Any]) -> None:
+        sent.append(message)
+
+    await middleware({"type": "http", "method": "GET", "path": path, "headers": []}, receive, send)
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_session_middleware_rejects_expired_session():
+    app_calls: List[str] = []
+
+    async def app(scope, receive, send):
+        app_calls.append(scope["path"])
+
+    safety = DummySafety(active=False)
+    middleware = SSESessionMiddleware(app, safety=safety, protected_paths=("/sse",))
+
+    sent = await call_middleware(middleware, "/sse/system/stream/realtime_metrics")
+    assert sent[0]["status"] == 200
+    assert (b"content-type", b"text/event-stream; charset=utf-8") in sent[0]["headers"]
+    assert sent[1]["body"] == SSE_UNAUTHORIZED_FRAME
+    assert app_calls == []
+
+    # Only whole path segments are protected
+    assert await call_middleware(middleware, "/sseanything") == []
+    assert app_calls == ["/sseanything"]
+
+    safety.active = True
+    await call_middleware(middleware, "/sse/system/stream/realtime_metrics")
+    assert app_calls == ["/sseanything", "/sse/system/stream/realtime_metrics"]
@@ -0,0 +1,152 @@
+###########EXTERNAL IMPORTS############
+
+import asyncio
+import os
+import signal
+import time
+import types
+import pytest
+
+#######################################
+
+#############LOCAL IMPORTS#############
+
+from analytics.system import SystemMonitor
+
+#######################################
+
+requires_fork = pytest.mark.skipif(
+    SystemMonitor.get_writer_context().get_start_method() != "fork", reason="writer patches need a forked writer"
+)
+
+
+def install_stop_handlers(loop: asyncio.AbstractEventLoop, stop_event: asyncio.Event) -> None:
+    # Same handlers main.py installs
+    for stop_signal in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(stop_signal, stop_event.set)
+
+
+def remove_stop_handlers(loop: asyncio.AbstractEventLoop) -> None:
+    for stop_signal in (signal.SIGINT, signal.SIGTERM):
+        loop.remove_signal_handler(stop_signal)
+
+
+@pytest.mark.asyncio
+async def test_writer_is_stopped_by_sigterm_despite_loop_handlers():
+    loop = asyncio.get_running_loop()
+    stop_event = asyncio.Event()
+    install_stop_handlers(loop, stop_event)
+    monitor = SystemMonitor()
+    try:
+        await monitor.start()
+        # The first snapshot proves the writer is past its signal setup
+        await asyncio.wait_for(monitor.data_updated.wait(), timeout=5)
+        writer_process = monitor.writer_process
+        assert writer_process is not None
+
+        os.kill(writer_process.pid, signal.SIGTERM)
+        await loop.run_in_executor(None, writer_process.join, 5)
+        await asyncio.sleep(0.1)
+
+        assert writer_process.exitcode == -signal.SIGTERM
+        assert not stop_event.is_set()
+    finally:
+        await monitor.stop()
+        remove_stop_handlers(loop)
+
+
+@requires_fork
+@pytest.mark.asyncio
+async def test_stop_kills_stuck_writer(monkeypatch):
+    def stuck_partition_lookup(path):
+        time.sleep(3600)  # e.g. an unresponsive mount
+
+    monkeypatch.setattr(SystemMonitor, "get_disk_path_partition", staticmethod(stuck_partition_lookup))
+    loop = asyncio.get_running_loop()
+    stop_event = asyncio.Event()
+    install_stop_handlers(loop, stop_event)
+    monitor = SystemMonitor()
+    monitor.WRITER_JOIN_TIMEOUT_SECONDS = 0.2
+    try:
+        await monitor.start()
+        writer_pid = monitor.writer_process.pid
+        await asyncio.sleep(0.2)
+
+        started = time.monotonic()
+        await asyncio.wait_for(monitor.stop(), timeout=5)
+
+        assert time.monotonic() - started < 2
+        assert monitor.writer_process is None
+        with pytest.raises(ProcessLookupError):
+            os.kill(writer_pid, 0)  # Reaped, not left as a zombie
+        assert not stop_event.is_set()
+    finally:
+        remove_stop_handlers(loop)
+
+
+def open_fixture(path, content: bytes) -> int:
+    path.write_bytes(content)
+    fd = SystemMonitor.open_proc_file(str(path))
+    assert fd is not None
+    return fd
+
+
+def test_cpu_performance_from_proc_stat(tmp_path, monkeypatch):
+    monkeypatch.setattr("analytics.system.psutil.cpu_percent", lambda interval: 42.0)
+    stat_path = tmp_path / "stat"
+    fd = open_fixture(stat_path, b"cpu  100 0 50 800 50 0 0 0 7 0\ncpu0 100 0 50 800 50 0 0 0 7 0\n")
+    try:
+        usage, times = SystemMonitor.get_cpu_performance(fd)
+        assert (usage, times) == (0.0, (850, 1000))
+
+        stat_path.write_bytes(b"cpu  200 0 100 1550 50 0 0 0 9 0\n")
+        usage, times = SystemMonitor.get_cpu_performance(fd, times)
+        assert usage == pytest.approx(100.0 * 150 / 900)
+        assert times == (1600, 1900)
+
+        # A counter that did not advance reports idle instead of dividing by zero
+        assert SystemMonitor.get_cpu_performance(fd, times) == (0.0, times)
+
+        for malformed in (b"cpu  200 0 100\n", b"cpu  200 0 x 1550 50 0 0 0\n", b""):
+            stat_path.write_bytes(malformed)
+            assert SystemMonitor.get_cpu_performance(fd, times) == (42.0, None)
+    finally:
+        os.close(fd)
+
+
+def test_ram_performance_from_proc_meminfo(tmp_path, monkeypatch):
+    monkeypatch.setattr("analytics.system.psutil.virtual_memory", lambda: types.SimpleNamespace(available=1, total=2))
+    meminfo_path = tmp_path / "meminfo"
+    fd = open_fixture(meminfo_path, b"MemTotal:        8000 kB\nMemFree:         1000 kB\nMemAvailable:    2000 kB\n")
+    try:
+        assert SystemMonitor.get_ram_performance(fd) == (2000 * 1024, 8000 * 1024)
+
+        for malformed in (b"MemTotal:        8000 kB\nMemFree:         1000 kB\n", b"MemTotal: x kB\nMemAvailable: 1 kB\n"):
+            meminfo_path.write_bytes(malformed)
+            assert SystemMonitor.get_ram_performance(fd) == (1, 2)
+    finally:
+        os.close(fd)
+
+
+def test_disk_performance_from_proc_diskstats(tmp_path):
+    diskstats_path = tmp_path / "diskstats"
+    fd = open_fixture(
+        diskstats_path,
+        b"   8       0 sda 100 0 2000 0 300 0 4000 0 0 0 0\n   8       1 sda1 10 0 200 0 30 0 400 0 0 0 0\n",
+    )
+    try:
+        metrics = SystemMonitor.get_disk_performance("sda1", str(tmp_path), fd)
+        assert (metrics.read_bytes, metrics.write_bytes) == (200 * 512, 400 * 512)
+        assert metrics.io_valid and metrics.usage_valid
+
+        for malformed in (
+            b"   8       1 sda1 10 0 x 0 30 0 400\n",
+            b"   8       1 sda1 10 0\n",
+            b"   8       0 sda 1 0 2 0 3 0 4\n",
+        ):
+            diskstats_path.write_bytes(malformed)
+            metrics = SystemMonitor.get_disk_performance("sda1", str(tmp_path), fd)
+            assert not metrics.io_valid
+            assert (metrics.read_bytes, metrics.write_bytes) == (0, 0)
+    finally:
+        os.close(fd)
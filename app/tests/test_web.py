@@ -61,7 +61,7 @@ class DummyMeter(EnergyMeter):
 
 class DummyDeviceManager:
     def __init__(self, devices):
-        self.devices = devices
+        self.devices = {device.id: device for device in devices}
 
     def get_all_devices(self):
         return self.devices
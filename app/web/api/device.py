@@ -251,7 +251,7 @@ async def get_all_devices(
     """Retrieves status of all devices."""
 
     all_status = []
-    for device in device_manager.devices:
+    for device in device_manager.devices.values():
         current_status: Dict[str, Any] = {}
         current_status["id"] = device.id
         current_status["name"] = device.name
@@ -346,7 +346,7 @@ async def get_all_devices_with_image(
 
     all_status = []
     image_tasks: List[asyncio.Future[Dict[str, str]]] = []
-    for device in device_manager.devices:
+    for device in device_manager.devices.values():
         current_status: Dict[str, Any] = {}
         current_status["id"] = device.id
         current_status["name"] = device.name
@@ -1,7 +1,7 @@
 ###########EXTERNAL IMPORTS############
 
 import asyncio
-from typing import Optional, Set, Dict
+from typing import Any, Callable, Optional, Set, Dict
 
 #######################################
 
@@ -10,98 +10,118 @@ from typing import Optional, Set, Dict
 #######################################
 
 
+class BroadcastSubscription:
+    """
+    Per-subscriber handle returned by `Broadcaster.subscribe`.
+
+    Tracks the last broadcaster version consumed by the subscriber and
+    exposes an Event-like `wait()`/`clear()` interface on top of it. A new
+    subscription starts behind the broadcaster so the first `wait()`
+    returns immediately, forcing an initial update.
+    """
+
+    __slots__ = ("broadcaster", "seen_version")
+
+    def __init__(self, broadcaster: "Broadcaster"):
+        self.broadcaster = broadcaster
+        self.seen_version = broadcaster.version - 1
+
+    def is_set(self) -> bool:
+        """
+        Returns True if the broadcaster has signaled since the last `clear()`.
+        """
+
+        return self.seen_version != self.broadcaster.version
+
+    async def wait(self) -> None:
+        """
+        Waits until the broadcaster signals a version newer than the one
+        consumed by this subscriber.
+        """
+
+        while not self.is_set():
+            await self.broadcaster.generation.wait()
+
+    def clear(self) -> None:
+        """
+        Marks the current broadcaster version as consumed.
+        """
+
+        self.seen_version = self.broadcaster.version
+
+
 class Broadcaster:
     """
     Fan-out helper that broadcasts update signals to multiple subscribers.
 
-    A Broadcaster listens to a shared asyncio.Event (`signal`) and propagates
-    notifications to per-subscriber asyncio.Events. It guarantees deterministic
-    wake-up semantics without buffering or polling, making it suitable for
-    state-based streaming (e.g. SSE).
+    A Broadcaster is driven by a shared asyncio.Event (`signal`), watched by
+    the owning BroadcastService. On each signal `notify()` bumps a version
+    counter and sets a single generation Event that all subscribers wait
+    on, replacing it with a fresh one. Waking every subscriber is therefore
+    a single `set()` regardless of how many are connected. It guarantees
+    deterministic wake-up semantics without buffering or polling, making
+    it suitable for state-based streaming (e.g. SSE).
+
+    Encoded frames for the current version are kept in `frame_cache`, keyed
+    by the data function that produced them, so subscribers streaming the
+    same data share one snapshot and serialization per update.
     """
 
     def __init__(self, signal: asyncio.Event):
-        self.events: Set[asyncio.Event] = set()
+        self.subscriptions: Set[BroadcastSubscription] = set()
         self.signal = signal
-        self.signal_task: Optional[asyncio.Task] = None
         self.lock = asyncio.Lock()
+        self.version = 0
+        self.generation = asyncio.Event()
+        self.frame_cache: Dict[Callable[[], Any], bytes] = {}
+        self.active = True  # Cleared on shutdown so holders of this instance know to look it up again
 
     async def shutdown(self):
         """
-        Stop the broadcaster and cancel the internal fan-out task.
+        Stop the broadcaster.
 
-        Clears all subscriber events and ensures the background task
-        terminates cleanly. Safe to call multiple times.
+        Clears all subscriptions. Safe to call multiple times.
         """
 
-        task_to_cancel: Optional[asyncio.Task] = None
+        self.active = False
         async with self.lock:
-            self.events.clear()
-            task_to_cancel = self.signal_task
-            self.signal_task = None
+            self.subscriptions.clear()
 
-        if task_to_cancel:
-            try:
-                task_to_cancel.cancel()
-                await task_to_cancel
-            except asyncio.CancelledError:
-                pass
-
-    async def subscribe(self) -> asyncio.Event:
+    async def subscribe(self) -> BroadcastSubscription:
         """
         Register a new subscriber.
 
         Returns:
-            A per-subscriber asyncio.Event that will be set whenever
-            new data is available. The event is initially set to force
-            an immediate first update.
+            A BroadcastSubscription that becomes set whenever new data is
+            available. It is initially set to force an immediate first update.
         """
 
-        event = asyncio.Event()
-        event.set()  # Forces the first event to be sent
+        subscription = BroadcastSubscription(self)
         async with self.lock:
-            self.events.add(event)
-            if self.signal_task is None:
-                self.signal_task = asyncio.create_task(self.wait_for_signal())
-        return event
+            self.subscriptions.add(subscription)
+        return subscription
 
-    async def unsubscribe(self, event: asyncio.Event):
+    async def unsubscribe(self, subscription: BroadcastSubscription):
         """
         Unregister a subscriber.
-
-        If this was the last subscriber, the internal fan-out task is
-        cancelled automatically.
         """
 
-        task_to_cancel: Optional[asyncio.Task] = None
         async with self.lock:
-            self.events.discard(event)
-            if len(self.events) == 0 and self.signal_task:
-                task_to_cancel = self.signal_task
-                self.signal_task = None
-
-        if task_to_cancel:
-            try:
-                task_to_cancel.cancel()
-                await task_to_cancel
-            except asyncio.CancelledError:
-                pass
+            self.subscriptions.discard(subscription)
 
-    async def wait_for_signal(self) -> None:
+    def notify(self) -> None:
         """
-        Background fan-out loop.
+        Publishes a new version and wakes all subscribers through the
+        current generation event.
 
-        Waits for the shared signal to be set and propagates the
-        notification to all active subscriber events.
+        The swap has no await points, so it is atomic on the event loop and
+        needs no lock; subscribe/unsubscribe never wait behind the fan-out.
         """
 
-        while True:
-            await self.signal.wait()
-            self.signal.clear()
-
-            async with self.lock:
-                for event in self.events:
-                    event.set()
+        self.version += 1
+        self.frame_cache.clear()
+        generation, self.generation = self.generation, asyncio.Event()
+        generation.set()
 
 
 class BroadcastService:
@@ -111,11 +131,17 @@ class BroadcastService:
     This service allows multiple independent broadcasters to coexist
     (e.g. one per SSE endpoint) and provides safe registration, lookup,
     and shutdown semantics.
+
+    A single dispatcher task watches the signals of all registered
+    broadcasters and notifies the one whose signal fired, so the number of
+    background tasks does not grow with the number of broadcasters.
     """
 
     def __init__(self):
         self.broadcasters: Dict[str, Broadcaster] = {}
         self.lock = asyncio.Lock()
+        self.dispatcher_task: Optional[asyncio.Task] = None
+        self.registry_changed = asyncio.Event()
 
     async def get_broadcaster(self, name: str) -> Optional[Broadcaster]:
         """
@@ -135,6 +161,8 @@ class BroadcastService:
         """
         Register a new broadcaster.
 
+        Starts the dispatcher task on the first registration.
+
         Args:
             name: Unique broadcaster identifier.
             signal: Shared update signal driving this broadcaster.
@@ -147,6 +175,9 @@ class BroadcastService:
             if name in self.broadcasters:
                 raise RuntimeError(f"Broadcaster with name {name} already registered")
             self.broadcasters[name] = Broadcaster(signal)
+            self.registry_changed.set()
+            if self.dispatcher_task is None:
+                self.dispatcher_task = asyncio.create_task(self.dispatch_signals())
 
     async def unregister_broadcaster(self, name: str) -> None:
         """
@@ -158,6 +189,7 @@ class BroadcastService:
         broadcaster: Optional[Broadcaster] = None
         async with self.lock:
             broadcaster = self.broadcasters.pop(name, None)
+            self.registry_changed.set()
         if broadcaster:
             await broadcaster.shutdown()
 
@@ -165,13 +197,58 @@ class BroadcastService:
         """
         Shut down all registered broadcasters.
 
-        Cancels all internal fan-out tasks and clears the registry.
+        Cancels the dispatcher task and clears the registry.
         Intended for application shutdown.
         """
 
         async with self.lock:
             broadcasters = list(self.broadcasters.values())
             self.broadcasters.clear()
+            task_to_cancel = self.dispatcher_task
+            self.dispatcher_task = None
+
+        if task_to_cancel:
+            try:
+                task_to_cancel.cancel()
+                await task_to_cancel
+            except asyncio.CancelledError:
+                pass
 
         for broadcaster in broadcasters:
             await broadcaster.shutdown()
+
+    async def dispatch_signals(self) -> None:
+        """
+        Background dispatch loop shared by all broadcasters.
+
+        Waits on the signals of every registered broadcaster at once and,
+        when one fires, clears it and notifies that broadcaster. The set of
+        watched signals is refreshed whenever the registry changes.
+        """
+
+        # Pending signal waits, mapped to their broadcaster (None for the registry change wait)
+        waiters: Dict[asyncio.Future, Optional[Broadcaster]] = {}
+        try:
+            while True:
+                registered = set(self.broadcasters.values())
+                for waiter, broadcaster in list(waiters.items()):
+                    if broadcaster is not None and broadcaster not in registered:
+                        waiter.cancel()
+                        del waiters[waiter]
+                watched = set(waiters.values())
+                for broadcaster in registered - watched:
+                    waiters[asyncio.ensure_future(broadcaster.signal.wait())] = broadcaster
+                if None not in watched:
+                    waiters[asyncio.ensure_future(self.registry_changed.wait())] = None
+
+                done, _ = await asyncio.wait(waiters.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for waiter in done:
+                    broadcaster = waiters.pop(waiter)
+                    if broadcaster is None:
+                        self.registry_changed.clear()
+                    else:
+                        broadcaster.signal.clear()
+                        broadcaster.notify()
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
@@ -0,0 +1,80 @@
+###########EXTERNAL IMPORTS############
+
+from typing import Tuple
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+#######################################
+
+#############LOCAL IMPORTS#############
+
+from web.safety import HTTPSafety
+from web.sse.decorator import SSE_UNAUTHORIZED_FRAME
+
+#######################################
+
+
+def _matches_path_prefix(path: str, prefixes: Tuple[str, ...]) -> bool:
+    """
+    Returns True if `path` equals one of `prefixes` or lies below it on a path segment boundary.
+    """
+
+    return any(path == prefix or path.startswith(prefix + "/") for prefix in prefixes)
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZip compression middleware that leaves selected path prefixes untouched.
+
+    Requests under an excluded prefix (e.g. Server-Sent Events streams) are
+    passed straight to the application, so their frames are never buffered
+    by the compressor regardless of the response content type.
+    """
+
+    def __init__(self, app: ASGIApp, exclude_paths: Tuple[str, ...] = (), minimum_size: int = 1024) -> None:
+        super().__init__(app, minimum_size=minimum_size)
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and _matches_path_prefix(scope["path"], self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+class SSESessionMiddleware:
+    """
+    Pure ASGI middleware rejecting SSE requests without an active session.
+
+    This is the single connect-time session check for every stream under
+    `protected_paths`. The session is checked on the raw ASGI scope before
+    routing, so an unauthenticated stream is answered with a single
+    `auth_error` event without creating a response object, a generator or
+    a broadcaster subscription. Ongoing streams re-validate the session
+    periodically themselves.
+    """
+
+    def __init__(self, app: ASGIApp, safety: HTTPSafety, protected_paths: Tuple[str, ...] = ()) -> None:
+        self.app = app
+        self.safety = safety
+        self.protected_paths = protected_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not _matches_path_prefix(scope["path"], self.protected_paths)
+            or self.safety.is_session_active(Request(scope))
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # Same event an expiring stream ends with, so clients handle both cases alike
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"text/event-stream; charset=utf-8"), (b"cache-control", b"no-cache")],
+            }
+        )
+        await send({"type": "http.response.body", "body": SSE_UNAUTHORIZED_FRAME})
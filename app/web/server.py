@@ -2,8 +2,10 @@
 
 import asyncio
 import logging
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
 from fastapi import FastAPI, APIRouter
+from fastapi.staticfiles import StaticFiles
 from uvicorn import Config, Server
 
 #######################################
@@ -16,13 +18,15 @@ from controller.manager import DeviceManager
 from db.db import SQLiteDBClient
 from db.timedb import TimeDBClient
 from web.broadcast import BroadcastService
+from web.middleware import SelectiveGZipMiddleware, SSESessionMiddleware
 from analytics.system import SystemMonitor
 import web.api.auth as auth_api
 import web.api.device as device_api
 import web.api.nodes as nodes_api
 import web.api.system as system_api
 import web.sse.system as system_sse
-from conf.env import HTTP_HOSTNAME, HTTP_PORT
+from util.debug import LoggerManager
+from conf.env import HTTP_HOSTNAME, HTTP_PORT, UI_STATIC_PATH
 
 #######################################
 
@@ -48,6 +52,8 @@ class HTTPServer:
         - Component Integration: Connects the DeviceManager, databases, and security services
         - Server Lifecycle: Manages startup, execution, and graceful shutdown of the HTTP server
         - Middleware Management: Enables development-only middleware such as CORS when required
+        - Static UI: Optionally serves a prebuilt UI from `UI_STATIC_PATH` when no separate UI server is used
+        - Response Compression: GZip-compresses API responses, leaving SSE streams uncompressed
 
     Components:
         - device_manager (DeviceManager): Manages device lifecycle, validation, and real-time data acquisition
@@ -91,6 +97,9 @@ class HTTPServer:
         - Modular API structure supports maintainability and future extension
     """
 
+    GRACEFUL_SHUTDOWN_SECONDS = 2  # Time given to open connections (e.g. SSE streams) before they are cancelled
+    STOP_TIMEOUT_SECONDS = 5
+
     def __init__(
         self,
         device_manager: DeviceManager,
@@ -101,7 +110,7 @@ class HTTPServer:
         services.set_dependencies(
             HTTPSafety(), device_manager, db, timedb, system_monitor, BroadcastService()
         )  # Set dependencies for routers endpoints
-        self.server = FastAPI()
+        self.server = FastAPI(lifespan=self.lifespan)
         api_router = APIRouter(prefix="/api")
         sse_router = APIRouter(prefix="/sse")
         api_router.include_router(auth_api.router)  # Authorization router (handles authorization endpoints)
@@ -111,7 +120,15 @@ class HTTPServer:
         sse_router.include_router(system_sse.router)  # Performance router (handles performance metrics server events)
         self.server.include_router(api_router)
         self.server.include_router(sse_router)
+        if UI_STATIC_PATH:
+            # Mounted last so `/api` and `/sse` routes match first, everything else is served as a static file
+            self.server.mount("/", StaticFiles(directory=UI_STATIC_PATH, html=True), name="ui")
+        # Compress JSON responses, SSE streams must reach the client frame by frame
+        self.server.add_middleware(SelectiveGZipMiddleware, exclude_paths=(sse_router.prefix,), minimum_size=1024)
+        # Single connect-time session check for every SSE stream, unauthenticated ones are answered before routing
+        self.server.add_middleware(SSESessionMiddleware, safety=services.get_safety(), protected_paths=(sse_router.prefix,))
         self.run_task: Optional[asyncio.Task] = None
+        self.uvicorn_server: Optional[Server] = None
 
     async def start(self) -> None:
         """
@@ -119,15 +136,30 @@ class HTTPServer:
 
         This method creates a background task that runs the FastAPI server using `asyncio.create_task`.
         It should be called once during initialization or startup of the HTTP server component.
+        Services tied to the server are started by the application lifespan.
         """
 
         if self.run_task is not None:
             raise RuntimeError("Run task is already instantiated")
 
-        loop = asyncio.get_event_loop()
+        self.run_task = asyncio.create_task(self.run_server(), name="http-server")
+
+    @asynccontextmanager
+    async def lifespan(self, app: FastAPI) -> AsyncIterator[None]:
+        """
+        Application lifespan, run by Uvicorn around serving requests.
+
+        Registers the SSE broadcasters and starts the session cleanup task on
+        startup, and stops them on shutdown once in-flight requests are done.
+        """
+
         await self.init_broadcasters()
         await services.get_safety().start_cleanup_task()
-        self.run_task = loop.create_task(self.run_server())
+        try:
+            yield
+        finally:
+            await services.get_safety().stop_cleanup_task()
+            await services.get_broadcast_service().shutdown()
 
     async def init_broadcasters(self):
         """
@@ -138,16 +170,34 @@ class HTTPServer:
 
     async def stop(self) -> None:
         """
-        Stops the HTTP Server by cancelling the run task.
+        Stops the HTTP Server gracefully.
+
+        Asks Uvicorn to exit so it closes the listening socket, ends open
+        connections and runs the lifespan shutdown. If the server does not
+        finish within `STOP_TIMEOUT_SECONDS` the run task is cancelled.
+
+        Raises:
+            asyncio.CancelledError: If stop() itself is cancelled, after cancelling the run task.
         """
 
-        try:
-            if self.run_task:
-                self.run_task.cancel()
-                await self.run_task
-        except asyncio.CancelledError:
-            pass
+        if self.run_task:
+            if self.uvicorn_server:
+                self.uvicorn_server.should_exit = True
+            try:
+                await asyncio.wait_for(self.run_task, timeout=HTTPServer.STOP_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                # A run task cancelled elsewhere counts as stopped, a cancellation of stop() itself propagates
+                current_task = asyncio.current_task()
+                if current_task is not None and current_task.cancelling():
+                    self.run_task.cancel()
+                    self.run_task = None
+                    self.uvicorn_server = None
+                    raise
         self.run_task = None
+        self.uvicorn_server = None
+        # Lifespan shutdown is skipped if the server never started or was cancelled, both calls are idempotent
         await services.get_safety().stop_cleanup_task()
         await services.get_broadcast_service().shutdown()
 
@@ -159,6 +209,8 @@ class HTTPServer:
             - Binds the server to the specified host and port.
             - Disables live reload.
             - Suppresses default logging output.
+            - Parses HTTP with httptools instead of the pure Python h11 parser.
+            - Bounds the graceful shutdown, long-lived SSE streams are cancelled after it.
 
         It runs the server within the asyncio event loop.
         """
@@ -166,14 +218,17 @@ class HTTPServer:
         if HTTP_PORT is None:
             raise ValueError("HTTP Port was not specified in the environment.")
 
-        print(f"HTTP_PORT: {HTTP_PORT}, HTTP_HOSTNAME: {HTTP_HOSTNAME}")
+        logger = LoggerManager.get_logger(__name__)
+        logger.info("Starting HTTP server on %s:%s", HTTP_HOSTNAME, HTTP_PORT)
 
         config = Config(
             app=self.server,
             host=HTTP_HOSTNAME,
             port=HTTP_PORT,
             reload=False,
+            http="httptools",
+            timeout_graceful_shutdown=HTTPServer.GRACEFUL_SHUTDOWN_SECONDS,
             log_level=logging.CRITICAL + 1,
         )
-        server = Server(config)
-        await server.serve()
+        self.uvicorn_server = Server(config)
+        await self.uvicorn_server.serve()
@@ -1,12 +1,12 @@
 ###########EXTERNAL IMPORTS############
 
 import asyncio
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import wraps
 from enum import Enum
-import json
+import orjson
 import inspect
-from typing import Callable, Awaitable, Any, Optional
+from typing import Callable, Awaitable, Any, Dict, Optional
 from fastapi import Request
 from fastapi.responses import StreamingResponse
 
@@ -15,8 +15,8 @@ from fastapi.responses import StreamingResponse
 #############LOCAL IMPORTS#############
 
 from web.broadcast import Broadcaster
-from web.broadcast import BroadcastService
 from web.safety import HTTPSafety
+from web.dependencies import services
 from util.debug import LoggerManager
 
 #######################################
@@ -43,16 +43,32 @@ class SSECallerReturn:
 
     Specifies the broadcaster to subscribe to and the callable
     used to retrieve the latest data snapshot for streaming.
+
+    The callable is either a coroutine function or a plain function
+    returning the data; which one is resolved once on construction
+    (`is_async`) instead of on every streamed event.
     """
 
     broadcaster_name: str
     get_data_func: Callable[[], Any]
+    is_async: bool = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.is_async = inspect.iscoroutinefunction(self.get_data_func)
+
 
+SSECaller = Callable[[Request], Awaitable[SSECallerReturn]]
 
-SSECaller = Callable[[Request, HTTPSafety, BroadcastService], Awaitable[SSECallerReturn]]
+SESSION_CHECK_INTERVAL = 1.0  # Seconds a successful session check is reused by a stream
 
+# SSE framing is precomputed once so emitting an event only concatenates bytes
+_SSE_DATA_PREFIX = b"data: "
+_SSE_FRAME_END = b"\n\n"
+_SSE_EVENT_PREFIXES: Dict[SSEEvent, bytes] = {event: f"event: {event.value}\n".encode() for event in SSEEvent}
+_SSE_HEARTBEAT = _SSE_EVENT_PREFIXES[SSEEvent.HEARTBEAT] + _SSE_DATA_PREFIX + b"{}" + _SSE_FRAME_END
 
-def _sse_event(event: Optional[SSEEvent] = None, data: Optional[Any] = None) -> str:
+
+def _sse_event(event: Optional[SSEEvent] = None, data: Optional[Any] = None) -> bytes:
     """
     Format a Server-Sent Events (SSE) message.
 
@@ -60,43 +76,73 @@ def _sse_event(event: Optional[SSEEvent] = None, data: Optional[Any] = None) ->
     type and data payload. When neither is provided, a comment-based
     heartbeat message is returned to keep the connection alive.
 
+    The payload is serialized with orjson and returned as bytes, which
+    the streaming response writes without re-encoding.
+
     Args:
         event: Optional SSE event type.
         data: Optional JSON-serializable payload.
 
     Returns:
-        A string formatted according to the SSE protocol.
+        The message bytes formatted according to the SSE protocol.
     """
 
     if event and data:
-        return f"event: {event.value}\ndata: {json.dumps(data)}\n\n"
+        return (
+            _SSE_EVENT_PREFIXES[event]
+            + _SSE_DATA_PREFIX
+            + orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+            + _SSE_FRAME_END
+        )
     elif event:
-        return f"event: {event.value}\n\n"
+        return _SSE_EVENT_PREFIXES[event] + b"\n"
     elif data:
-        return f"data: {json.dumps(data)}\n\n"
+        return _SSE_DATA_PREFIX + orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS) + _SSE_FRAME_END
+
+    return _SSE_HEARTBEAT
+
+
+# Sent when a stream has no active session, also used by SSESessionMiddleware
+SSE_UNAUTHORIZED_FRAME = _sse_event(SSEEvent.AUTH_ERROR, {"message": "Unauthorized"})
+
+
+async def _get_frame(broadcaster: Broadcaster, get_data_func: Callable[[], Any], is_async: bool) -> bytes:
+    """
+    Return the encoded data frame for the broadcaster's current version.
 
-    return f"event: {SSEEvent.HEARTBEAT.value}\ndata: {{}}\n\n"
+    The first subscriber to ask builds the frame from `get_data_func` and
+    stores it in the broadcaster's frame cache, the others reuse it until
+    the next update clears the cache. A frame is only cached if no update
+    happened while its data was being resolved.
+    """
+
+    frame = broadcaster.frame_cache.get(get_data_func)
+    if frame is None:
+        version = broadcaster.version
+        frame = _sse_event(data=await get_data_func() if is_async else get_data_func())
+        if broadcaster.version == version:
+            broadcaster.frame_cache[get_data_func] = frame
+    return frame
 
 
-async def _resolve_data_func(data: Any) -> Any:
+async def _wait_for_disconnect(request: Request) -> None:
     """
-    Resolve a value that may be synchronous or awaitable.
+    Wait until the client disconnects.
 
-    If the value is awaitable, it is awaited; otherwise, it is returned
-    directly. This allows uniform handling of sync and async data sources.
+    Consumes ASGI receive messages until `http.disconnect` arrives, so a
+    single long-lived task replaces polling `request.is_disconnected()`.
     """
 
-    if inspect.isawaitable(data):
-        return await data
-    return data
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
 
 
 async def sse_generator(
-    protected: bool,
     request: Request,
     safety: HTTPSafety,
     broadcaster: Optional[Broadcaster],
     get_data_func: Callable[[], Any],
+    is_async: bool = False,
     heartbeat_interval: float = 3.0,
 ):
     """
@@ -107,12 +153,13 @@ async def sse_generator(
     `heartbeat_interval`, a heartbeat message is emitted to maintain
     connection liveness.
 
-    Data is obtained from `get_data_func`, which may be synchronous or
-    asynchronous.
+    Data is obtained from `get_data_func`, which is awaited when `is_async`
+    is True and called directly otherwise.
 
-    When `protected` is True, the generator performs lightweight, per-event
-    session validation and terminates the stream with an authentication
-    error event if the session becomes inactive.
+    The session is validated on connect by `SSESessionMiddleware`; the
+    generator re-validates it at most once per `SESSION_CHECK_INTERVAL`
+    and terminates the stream with an authentication error event if the
+    session becomes inactive.
 
     Ensures proper subscription cleanup on client disconnect, authorization
     failure, or generator termination.
@@ -125,32 +172,50 @@ async def sse_generator(
         yield _sse_event(SSEEvent.INTERNAL_ERROR, {"message": "Broadcaster not found"})
         return
 
+    loop = asyncio.get_running_loop()
+    session_checked_at = loop.time()  # Checked on connect by SSESessionMiddleware
     subscription = await broadcaster.subscribe()
+    disconnect_task = asyncio.create_task(_wait_for_disconnect(request))
+    update_task: Optional[asyncio.Task] = None
     try:
-        while not await request.is_disconnected():
-            try:
-                await asyncio.wait_for(subscription.wait(), timeout=heartbeat_interval)
+        while True:
+            # The update wait survives heartbeat timeouts, so a new task is only created after each update
+            if update_task is None:
+                update_task = asyncio.create_task(subscription.wait())
+            done, _ = await asyncio.wait(
+                (disconnect_task, update_task), timeout=heartbeat_interval, return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnect_task in done:
+                break
+
+            has_update = update_task in done
+            if has_update:
+                update_task = None
                 subscription.clear()
-                has_update = True
 
-            except asyncio.TimeoutError:
-                has_update = False
-
-            if protected and not safety.is_session_active(request):
-                yield _sse_event(SSEEvent.AUTH_ERROR, {"message": "Unauthorized"})
-                break
+            # A valid session is trusted for SESSION_CHECK_INTERVAL, an expired one is still caught within that delay
+            if loop.time() - session_checked_at >= SESSION_CHECK_INTERVAL:
+                if not safety.is_session_active(request):
+                    yield SSE_UNAUTHORIZED_FRAME
+                    break
+                session_checked_at = loop.time()
 
             if has_update:
-                data = await _resolve_data_func(get_data_func())
-                yield _sse_event(data=data)
+                yield await _get_frame(broadcaster, get_data_func, is_async)
             else:
                 yield _sse_event()
 
+            # Let the loop flush this frame to the socket before the next one can be produced
+            await asyncio.sleep(0)
+
     finally:
+        disconnect_task.cancel()
+        if update_task is not None:
+            update_task.cancel()
         await broadcaster.unsubscribe(subscription)
 
 
-def auth_sse(protected: bool = True):
+def auth_sse():
     """
     Decorator for defining authenticated Server-Sent Events (SSE) endpoints.
 
@@ -158,8 +223,9 @@ def auth_sse(protected: bool = True):
     subscribes to the specified broadcaster and streams data using a
     shared SSE generator.
 
-    When `protected` is True, session validity is enforced during
-    streaming via lightweight per-event checks.
+    All SSE endpoints require a session: `SSESessionMiddleware` rejects
+    requests without one before routing, and session validity is then
+    enforced during streaming via lightweight periodic checks.
     """
 
     def decorator(caller: SSECaller) -> Callable:
@@ -168,22 +234,32 @@ def auth_sse(protected: bool = True):
 
         The wrapped function resolves the broadcaster name and data
         provider used to initialize the SSE stream.
+
+        Resolved broadcasters are memoized per endpoint by name and only
+        looked up again once they have been shut down.
         """
 
+        broadcasters: Dict[str, Broadcaster] = {}
+
         @wraps(caller)
-        async def wrapper(
-            request: Request,
-            safety: HTTPSafety,
-            broadcast_service: BroadcastService,
-            **kwargs,
-        ) -> StreamingResponse:
+        async def wrapper(request: Request, **kwargs) -> StreamingResponse:
             """
             Initializes and returns an SSE streaming response for the request.
+
+            Services are read directly from the dependency container rather than
+            through FastAPI's dependency injection, which would resolve them
+            again on every request.
             """
 
-            options = await caller(request, safety, broadcast_service, **kwargs)
-            broadcaster = await broadcast_service.get_broadcaster(options.broadcaster_name)
-            generator = sse_generator(protected, request, safety, broadcaster, options.get_data_func)
+            safety = services.get_safety()
+            broadcast_service = services.get_broadcast_service()
+            options = await caller(request, **kwargs)
+            broadcaster = broadcasters.get(options.broadcaster_name)
+            if broadcaster is None or not broadcaster.active:
+                broadcaster = await broadcast_service.get_broadcaster(options.broadcaster_name)
+                if broadcaster is not None:
+                    broadcasters[options.broadcaster_name] = broadcaster
+            generator = sse_generator(request, safety, broadcaster, options.get_data_func, options.is_async)
             return StreamingResponse(generator, media_type="text/event-stream")
 
         return wrapper
@@ -1,15 +1,14 @@
 ###########EXTERNAL IMPORTS############
 
-from fastapi import APIRouter, Request, Depends
+from enum import Enum
+from typing import Any, Callable, Dict
+from fastapi import APIRouter, Request
 
 #######################################
 
 #############LOCAL IMPORTS#############
 
 from web.sse.decorator import auth_sse, SSECallerReturn
-from web.safety import HTTPSafety
-from web.broadcast import BroadcastService
-from analytics.system import SystemMonitor
 from web.dependencies import services
 
 #######################################
@@ -17,69 +16,34 @@ from web.dependencies import services
 router = APIRouter(prefix="/system", tags=["system"])
 
 
-@router.get("/get_realtime_metrics")
-@auth_sse(protected=True)
-async def get_system_metrics(
-    request: Request,
-    safety: HTTPSafety = Depends(services.get_safety),
-    broadcast_service: BroadcastService = Depends(services.get_broadcast_service),
-    system_monitor: SystemMonitor = Depends(services.get_system_monitor),
-) -> SSECallerReturn:
-    """Retrieves the system real time performance metrics."""
+class SystemMetric(str, Enum):
+    """
+    Enumerates the system metrics that can be streamed.
 
-    def get_data():
-        return system_monitor.get_realtime_data().get_data()
+    Values match the suffix of the legacy `get_<metric>` stream paths.
+    """
 
-    return SSECallerReturn("system", get_data)
+    REALTIME_METRICS = "realtime_metrics"
+    CPU_USAGE_HISTORY = "cpu_usage_history"
+    RAM_USAGE_HISTORY = "ram_usage_history"
+    DISK_READ_SPEED_HISTORY = "disk_read_speed_history"
+    DISK_WRITE_SPEED_HISTORY = "disk_write_speed_history"
 
 
-@router.get("/get_cpu_usage_history")
-@auth_sse(protected=True)
-async def get_cpu_usage_history(
-    request: Request,
-    safety: HTTPSafety = Depends(services.get_safety),
-    broadcast_service: BroadcastService = Depends(services.get_broadcast_service),
-    system_monitor: SystemMonitor = Depends(services.get_system_monitor),
-) -> SSECallerReturn:
-    """Retrieves historical CPU usage data."""
+# Data functions are defined once per metric so every subscriber of a metric shares the broadcaster's cached frame
+METRIC_DATA_FUNCS: Dict[SystemMetric, Callable[[], Any]] = {
+    SystemMetric.REALTIME_METRICS: lambda: services.get_system_monitor().get_realtime_data().get_data(),
+    SystemMetric.CPU_USAGE_HISTORY: lambda: services.get_system_monitor().get_cpu_usage_history(),
+    SystemMetric.RAM_USAGE_HISTORY: lambda: services.get_system_monitor().get_ram_usage_history(),
+    SystemMetric.DISK_READ_SPEED_HISTORY: lambda: services.get_system_monitor().get_disk_read_speed_history(),
+    SystemMetric.DISK_WRITE_SPEED_HISTORY: lambda: services.get_system_monitor().get_disk_write_speed_history(),
+}
 
-    return SSECallerReturn("system", system_monitor.get_cpu_usage_history)
 
+@router.get("/stream/{metric}")
+@router.get("/get_{metric}", include_in_schema=False)  # Legacy per-metric paths
+@auth_sse()
+async def stream_system_metric(request: Request, metric: SystemMetric) -> SSECallerReturn:
+    """Streams the requested system performance metric."""
 
-@router.get("/get_ram_usage_history")
-@auth_sse(protected=True)
-async def get_ram_usage_history(
-    request: Request,
-    safety: HTTPSafety = Depends(services.get_safety),
-    broadcast_service: BroadcastService = Depends(services.get_broadcast_service),
-    system_monitor: SystemMonitor = Depends(services.get_system_monitor),
-) -> SSECallerReturn:
-    """Retrieves historical RAM usage data."""
-
-    return SSECallerReturn("system", system_monitor.get_ram_usage_history)
-
-
-@router.get("/get_disk_read_speed_history")
-@auth_sse(protected=True)
-async def get_disk_read_speed_history(
-    request: Request,
-    safety: HTTPSafety = Depends(services.get_safety),
-    broadcast_service: BroadcastService = Depends(services.get_broadcast_service),
-    system_monitor: SystemMonitor = Depends(services.get_system_monitor),
-) -> SSECallerReturn:
-    """Retrieves historical disk read speed data."""
-
-    return SSECallerReturn("system", system_monitor.get_disk_read_speed_history)
-
-
-@router.get("/get_disk_write_speed_history")
-@auth_sse(protected=True)
-async def get_disk_write_speed_history(
-    request: Request,
-    safety: HTTPSafety = Depends(services.get_safety),
-    broadcast_service: BroadcastService = Depends(services.get_broadcast_service),
-    system_monitor: SystemMonitor = Depends(services.get_system_monitor),
-) -> SSECallerReturn:
-    """Retrieves historical disk write speed data."""
-
-    return SSECallerReturn("system", system_monitor.get_disk_write_speed_history)
+    return SSECallerReturn("system", METRIC_DATA_FUNCS[metric])
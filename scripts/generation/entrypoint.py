@@ -1,9 +1,12 @@
+import logging
 import generate_cert as generate_cert
 import generate_mqtt_cfg as generate_mqtt_cfg
 import generate_mqtt_client_cfg as generate_mqtt_client_cfg
 
 
 def main():
+    # Importing the generators leaves logging alone, the entrypoint owns the root logger configuration
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     generate_cert.generate()
     generate_mqtt_cfg.generate()
     generate_mqtt_client_cfg.generate()
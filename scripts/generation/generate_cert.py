@@ -1,7 +1,10 @@
 import os
 import ipaddress
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from cryptography import x509
 from cryptography.x509.oid import NameOID
 from cryptography.hazmat.primitives import hashes, serialization
@@ -18,19 +21,56 @@ CA_CERT = CA_DIR / "enervigil-ca.crt"
 VALIDITY_DAYS = 7300  # 20 years
 HOSTNAME = os.getenv("HOSTNAME")
 
+logger = logging.getLogger(__name__)
+
+
+def generate_rsa_key(key_size):
+    # Keys are not picklable, so worker processes hand them back as PEM
+    key = rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+    return key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+def get_pool_context():
+    # Fork workers start from the imported module instead of re-importing it, default context where fork is unavailable
+    try:
+        return multiprocessing.get_context("fork")
+    except ValueError:
+        return multiprocessing.get_context()
+
+
+def load_key(pem):
+    return serialization.load_pem_private_key(pem, password=None)
+
+
+def write_atomic(path, data):
+    # Readers (mosquitto, reverse proxies) only ever see a complete file, even if generation is interrupted
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        os.write(fd, data)
+        os.fdatasync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
 
 def write_key(path, key):
-    path.write_bytes(
+    write_atomic(
+        path,
         key.private_bytes(
             encoding=serialization.Encoding.PEM,
             format=serialization.PrivateFormat.TraditionalOpenSSL,
             encryption_algorithm=serialization.NoEncryption(),
-        )
+        ),
     )
 
 
 def write_cert(path, cert):
-    path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    write_atomic(path, cert.public_bytes(serialization.Encoding.PEM))
 
 
 def generate():
@@ -38,31 +78,54 @@ def generate():
     CA_DIR.mkdir(parents=True, exist_ok=True)
 
     if SERVER_KEY.exists() and SERVER_CERT.exists():
-        print("Certificate already exist — skipping.")
+        logger.info("Certificate already exist — skipping.")
         return
 
-    print("Generating CA key...")
-    ca_key = rsa.generate_private_key(public_exponent=65537, key_size=4096)
-
-    ca_subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "ENERVIGIL-CA")])
-
-    ca_cert = (
-        x509.CertificateBuilder()
-        .subject_name(ca_subject)
-        .issuer_name(ca_subject)
-        .public_key(ca_key.public_key())
-        .serial_number(x509.random_serial_number())
-        .not_valid_before(datetime.now())
-        .not_valid_after(datetime.now() + timedelta(days=VALIDITY_DAYS))
-        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
-        .sign(ca_key, hashes.SHA256())
-    )
+    # Both certificates share one aware validity window
+    not_before = datetime.now(timezone.utc)
+    not_after = not_before + timedelta(days=VALIDITY_DAYS)
+
+    ca_cert = None
+    if CA_KEY.exists() and CA_CERT.exists():
+        ca_cert = x509.load_pem_x509_certificate(CA_CERT.read_bytes())
+        if ca_cert.not_valid_after_utc <= not_before:
+            logger.info("Existing CA has expired, regenerating...")
+            ca_cert = None
+
+    if ca_cert is not None:
+        # Reuse the existing CA so only the server key has to be generated
+        logger.info("Loading existing CA...")
+        ca_key = load_key(CA_KEY.read_bytes())
+        logger.info("Generating server key...")
+        server_key = load_key(generate_rsa_key(2048))
+        # The server certificate must not outlive its issuer
+        not_after = min(not_after, ca_cert.not_valid_after_utc)
+    else:
+        # RSA prime search is CPU bound, both keys are generated in parallel on separate cores
+        with ProcessPoolExecutor(max_workers=2, mp_context=get_pool_context()) as executor:
+            logger.info("Generating CA and server keys...")
+            ca_key_future = executor.submit(generate_rsa_key, 4096)
+            server_key_future = executor.submit(generate_rsa_key, 2048)
+            ca_key = load_key(ca_key_future.result())
+            server_key = load_key(server_key_future.result())
+
+        ca_subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "ENERVIGIL-CA")])
+
+        ca_cert = (
+            x509.CertificateBuilder()
+            .subject_name(ca_subject)
+            .issuer_name(ca_subject)
+            .public_key(ca_key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(not_before)
+            .not_valid_after(not_after)
+            .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+            .sign(ca_key, hashes.SHA256())
+        )
 
-    write_key(CA_KEY, ca_key)
-    write_cert(CA_CERT, ca_cert)
+        write_key(CA_KEY, ca_key)
+        write_cert(CA_CERT, ca_cert)
 
-    print("Generating server key...")
-    server_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
     subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "ENERVIGIL")])
 
     san_entries = [
@@ -84,8 +147,8 @@ def generate():
         .issuer_name(ca_cert.subject)
         .public_key(server_key.public_key())
         .serial_number(x509.random_serial_number())
-        .not_valid_before(datetime.now())
-        .not_valid_after(datetime.now() + timedelta(days=VALIDITY_DAYS))
+        .not_valid_before(not_before)
+        .not_valid_after(not_after)
         .add_extension(san, critical=False)
         .sign(ca_key, hashes.SHA256())
     )
@@ -93,7 +156,9 @@ def generate():
     write_key(SERVER_KEY, server_key)
     write_cert(SERVER_CERT, server_cert)
 
-    print("Certificates generated successfully.")
+    logger.info("Certificates generated successfully.")
 
 
-generate()
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    generate()